@@ -0,0 +1,112 @@
+"""Conversation history: memory per 1,000 sessions and per-turn CPU at long histories.
+
+Compares the previous representation (a list of {role, content, timestamp ISO string}
+dicts, with the model input list rebuilt on every turn) against SessionHistory in
+lib/history.py (input items kept up to date, interned roles, float timestamps).
+
+  python benchmarks/bench_history.py --sessions 1000 --messages 20 --lengths 100 1000 10000
+"""
+import argparse
+import os
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.history import SessionHistory  # noqa: E402
+
+
+def _now_iso() -> str:
+	return datetime.utcnow().isoformat() + "Z"
+
+
+def legacy_turn(history: list, message: str) -> list:
+	# lib/agent.py handle_chat_message before SessionHistory
+	formatted_history = [{"role": entry["role"], "content": entry["content"]} for entry in history]  # noqa: F841
+	history.append({"role": "user", "content": message, "timestamp": _now_iso()})
+	items = []
+	for entry in history:
+		role = entry.get("role", "user")
+		if role not in ("user", "assistant", "system", "developer"):
+			role = "user"
+		items.append({"type": "message", "role": role, "content": entry.get("content", "")})
+	history.append({"role": "assistant", "content": "ok", "timestamp": _now_iso()})
+	return items
+
+
+def compact_turn(history: SessionHistory, message: str) -> list:
+	history.append("user", message)
+	items = history.items
+	history.append("assistant", "ok")
+	return items
+
+
+def messages(n: int):
+	# Distinct strings, as real messages would be
+	return [f"message {i}: please list the open tasks for project {i % 17}" for i in range(n)]
+
+
+def memory_per_sessions(sessions: int, count: int) -> tuple:
+	texts = messages(count)
+
+	def build_legacy():
+		store = {}
+		for s in range(sessions):
+			history = store[f"session-{s}"] = []
+			for i, text in enumerate(texts):
+				history.append({"role": "user" if i % 2 == 0 else "assistant", "content": text, "timestamp": _now_iso()})
+		return store
+
+	def build_compact():
+		store = {}
+		for s in range(sessions):
+			history = store[f"session-{s}"] = SessionHistory()
+			for i, text in enumerate(texts):
+				history.append("user" if i % 2 == 0 else "assistant", text)
+		return store
+
+	results = []
+	for build in (build_legacy, build_compact):
+		tracemalloc.start()
+		store = build()
+		used = tracemalloc.get_traced_memory()[0]
+		tracemalloc.stop()
+		del store
+		results.append(used)
+	return tuple(results)
+
+
+def turn_cost(length: int, repeat: int) -> tuple:
+	texts = messages(length)
+	legacy = [{"role": "user", "content": t, "timestamp": _now_iso()} for t in texts]
+	compact = SessionHistory.from_dicts(legacy)
+	# Each timed call adds two messages; the history stays ~`length` long
+	legacy_time = min(timeit.repeat(lambda: legacy_turn(legacy, "next"), number=repeat, repeat=3)) / repeat
+	compact_time = min(timeit.repeat(lambda: compact_turn(compact, "next"), number=repeat, repeat=3)) / repeat
+	return legacy_time, compact_time
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--sessions", type=int, default=1000)
+	parser.add_argument("--messages", type=int, default=20, help="messages per session for the memory test")
+	parser.add_argument("--lengths", type=int, nargs="+", default=[100, 1000, 10000], help="history lengths for the CPU test")
+	parser.add_argument("--repeat", type=int, default=50)
+	args = parser.parse_args()
+
+	legacy_bytes, compact_bytes = memory_per_sessions(args.sessions, args.messages)
+	print(f"Memory for {args.sessions} sessions x {args.messages} messages (message text included)")
+	print(f"  dict entries    {legacy_bytes / 1024:>10.0f} KB")
+	print(f"  SessionHistory  {compact_bytes / 1024:>10.0f} KB  ({compact_bytes / legacy_bytes:.0%})")
+
+	print("\nPer-turn CPU (user + assistant message)")
+	print(f"{'history':>9} {'dict entries':>14} {'SessionHistory':>16}")
+	for length in args.lengths:
+		legacy_time, compact_time = turn_cost(length, args.repeat)
+		print(f"{length:>9} {legacy_time * 1e6:>11.1f} us {compact_time * 1e6:>13.1f} us")
+
+
+if __name__ == "__main__":
+	main()
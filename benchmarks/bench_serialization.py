@@ -0,0 +1,107 @@
+"""Micro-benchmark: turning meeting documents into tool-output strings.
+
+Compares the previous path (top-level-only `_serialize_doc`, then `str()` as the agents
+SDK does for non-string tool results) with the FieldPlan + compact `dumps` path in
+lib/serialization.py, with orjson and with the stdlib json fallback.
+
+  python benchmarks/bench_serialization.py --docs 100 --repeat 200
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib import serialization  # noqa: E402
+from lib.mongo import MEETING_PLAN  # noqa: E402
+
+
+def make_meeting(rng: random.Random) -> dict:
+	started = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(hours=rng.randint(0, 5000))
+	return {
+		"_id": ObjectId(),
+		"title": f"Weekly sync {rng.randint(1, 999)}",
+		"project_id": str(ObjectId()),
+		"occurred_at": started,
+		"created_at": started + timedelta(minutes=45),
+		"attendees": [
+			{"user_id": ObjectId(), "name": f"Person {i}", "email": f"person{i}@example.com", "joined_at": started}
+			for i in range(rng.randint(2, 8))
+		],
+		"summary": {
+			"short_summary": "Discussed roadmap, blockers and next release. " * 3,
+			"action_items": [
+				{"owner_id": ObjectId(), "text": f"Follow up on item {i}", "due": started + timedelta(days=i)}
+				for i in range(rng.randint(1, 6))
+			],
+			"generated_at": started + timedelta(hours=1),
+		},
+		"transcript": " ".join(rng.choice(["alpha", "beta", "release", "deadline", "client", "design"]) for _ in range(2000)),
+	}
+
+
+def legacy_serialize_doc(doc: dict) -> dict:
+	# lib/mongo.py before lib/serialization.py: top-level ObjectId/datetime only
+	out = dict(doc)
+	if "_id" in out:
+		out["id"] = str(out["_id"])
+		out.pop("_id", None)
+	for k, v in list(out.items()):
+		if isinstance(v, ObjectId):
+			out[k] = str(v)
+		if isinstance(v, datetime):
+			out[k] = v.isoformat()
+	return out
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--docs", type=int, default=100)
+	parser.add_argument("--repeat", type=int, default=200)
+	args = parser.parse_args()
+
+	rng = random.Random(0)
+	docs = [make_meeting(rng) for _ in range(args.docs)]
+
+	def legacy():
+		return str([legacy_serialize_doc(d) for d in docs])
+
+	def plan_orjson():
+		return serialization.dumps([MEETING_PLAN.apply(d) for d in docs])
+
+	def plan_stdlib():
+		orjson, serialization.orjson = serialization.orjson, None
+		try:
+			return serialization.dumps([MEETING_PLAN.apply(d) for d in docs])
+		finally:
+			serialization.orjson = orjson
+
+	def generic_stdlib():
+		return json.dumps(docs, default=str)
+
+	cases = [
+		("legacy _serialize_doc + str()", legacy),
+		("json.dumps(default=str)", generic_stdlib),
+		("FieldPlan + dumps (stdlib json)", plan_stdlib),
+	]
+	if serialization.orjson is not None:
+		cases.append(("FieldPlan + dumps (orjson)", plan_orjson))
+
+	# The new output must be valid JSON with no BSON left in it
+	json.loads(plan_stdlib())
+
+	print(f"{args.docs} meeting documents, best of 5 x {args.repeat} runs")
+	print(f"{'path':<34} {'ms/batch':>9} {'bytes':>9}")
+	for name, fn in cases:
+		best = min(timeit.repeat(fn, number=args.repeat, repeat=5)) / args.repeat
+		print(f"{name:<34} {best * 1000:>9.3f} {len(fn()):>9}")
+
+
+if __name__ == "__main__":
+	main()
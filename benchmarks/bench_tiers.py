@@ -0,0 +1,116 @@
+"""Latency and cost of tiered model routing (lib/tiers.py) against the large model alone.
+
+Runs the chat turn and the meeting assignment in-process on the offline stub model
+(lib/stub_model.py) with a latency profile per tier. The stub's triage answers are
+derived from a hash of the input, so sweeping --threshold shows how the escalation
+rate trades latency and cost. Cost is the simulated token usage priced per tier
+(per million tokens); cancelled speculative calls still pay for their input.
+
+  python benchmarks/bench_tiers.py --requests 200 --small-ms 80 --large-ms 600 --threshold 0.5 0.7 0.9
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from agents import RunConfig, Runner
+
+from lib.stub_model import StubModelProvider
+from lib.tiers import TierConfig, TieredChat, TieredMeetingCategoriser, tier_metrics
+
+SMALL = "stub-small"
+LARGE = "stub-large"
+
+MESSAGES = [
+	"List my projects",
+	"What meetings are not assigned to a project yet?",
+	"Ask the task manager to create a task to update the roadmap by Friday",
+	"Compare the progress of the website redesign with the mobile app and suggest what to prioritise next sprint",
+	"Show the overview of the onboarding project",
+	"Mark the API migration tasks as done and tell me which projects are overdue",
+]
+
+PROJECTS = [
+	{"id": f"p{i}", "title": title, "due_date": None}
+	for i, title in enumerate(("Website redesign", "Mobile app", "Onboarding", "API migration"))
+]
+
+
+def _meeting(i: int) -> Dict[str, object]:
+	return {"id": f"m{i}", "title": f"Weekly sync {i}", "attendees": ["alice", "bob"], "summary": {"short_summary": f"Discussed item {i} of the roadmap."}}
+
+
+async def _measure(requests: int, concurrency: int, call: Callable[[int], Awaitable[object]]) -> List[float]:
+	latencies: List[float] = []
+	semaphore = asyncio.Semaphore(concurrency)
+
+	async def one(i: int) -> None:
+		async with semaphore:
+			started = time.perf_counter()
+			await call(i)
+			latencies.append((time.perf_counter() - started) * 1000)
+
+	await asyncio.gather(*(one(i) for i in range(requests)))
+	return latencies
+
+
+def _cost(usage: Dict[str, Dict[str, int]], prices: Dict[str, float]) -> float:
+	return sum((u["input_tokens"] + u["output_tokens"]) * prices.get(model, 0.0) / 1_000_000 for model, u in usage.items())
+
+
+async def run(args) -> None:
+	prices = {SMALL: args.small_price, LARGE: args.large_price}
+	print(f"{'scenario':<34} {'mean ms':>8} {'p95 ms':>8} {'cost $':>10} {'small':>6} {'large':>6}")
+
+	for threshold in args.threshold:
+		for name, speculative in (("large only", None), ("tiered", False), ("tiered + speculative", True)):
+			for agent in ("chat", "meeting"):
+				provider = StubModelProvider(latency_ms=0, profiles={SMALL: {"latency_ms": args.small_ms}, LARGE: {"latency_ms": args.large_ms}})
+				run_config = RunConfig(model_provider=provider, tracing_disabled=True)
+				config = TierConfig(SMALL, LARGE, threshold=threshold, speculative=bool(speculative))
+				if agent == "chat":
+					from lib.agent import chat_agent
+					tiered = TieredChat(chat_agent, config)
+					if speculative is None:
+						call = lambda i: Runner.run(tiered.large_agent, [{"type": "message", "role": "user", "content": MESSAGES[i % len(MESSAGES)] + f" ({i})"}], run_config=run_config)
+					else:
+						call = lambda i: tiered.run([{"type": "message", "role": "user", "content": MESSAGES[i % len(MESSAGES)] + f" ({i})"}], run_config=run_config)
+				else:
+					tiered = TieredMeetingCategoriser(config)
+					if speculative is None:
+						call = lambda i: Runner.run(tiered.large_agent, f"Meeting: {_meeting(i)}\n\nProjects: {PROJECTS}", run_config=run_config)
+					else:
+						call = lambda i: tiered.propose(_meeting(i), PROJECTS, run_config=run_config)
+
+				before = tier_metrics().get(agent, {})
+				latencies = await _measure(args.requests, args.concurrency, call)
+				after = tier_metrics().get(agent, {})
+				routed = {tier: after.get(tier, 0) - before.get(tier, 0) for tier in ("small", "large")}
+				if speculative is None:
+					routed = {"small": 0, "large": args.requests}
+				p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+				label = f"{agent} {name} @{threshold:g}"
+				print(f"{label:<34} {statistics.mean(latencies):>8.1f} {p95:>8.1f} {_cost(provider.usage, prices):>10.4f} {routed['small']:>6} {routed['large']:>6}")
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--requests", type=int, default=200)
+	parser.add_argument("--concurrency", type=int, default=16)
+	parser.add_argument("--small-ms", type=float, default=80, help="simulated latency of the small model")
+	parser.add_argument("--large-ms", type=float, default=600, help="simulated latency of the large model")
+	parser.add_argument("--small-price", type=float, default=0.4, help="$ per million tokens, small model")
+	parser.add_argument("--large-price", type=float, default=8.0, help="$ per million tokens, large model")
+	parser.add_argument("--threshold", type=float, nargs="+", default=[0.7], help="triage confidence thresholds to compare")
+	args = parser.parse_args()
+	asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+	main()
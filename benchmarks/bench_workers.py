@@ -0,0 +1,86 @@
+"""Chat throughput of the multi-worker serving mode (serve.py) by number of workers.
+
+Each run starts `serve.py` with the offline stub model (AGENT_MODEL_PROVIDER=stub) and
+drives it with concurrent WebSocket clients, one session per client. STUB_MODEL_CPU_MS
+simulates the per-turn CPU cost that a single process cannot spread across cores.
+
+  python benchmarks/bench_workers.py --workers 1 2 4 --clients 32 --turns 20 --cpu-ms 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+import requests
+import websockets
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_server(workers: int, port: int, cpu_ms: float, latency_ms: float) -> subprocess.Popen:
+	env = dict(os.environ, AGENT_MODEL_PROVIDER="stub", STUB_MODEL_CPU_MS=str(cpu_ms), STUB_MODEL_LATENCY_MS=str(latency_ms), API_KEY="")
+	process = subprocess.Popen(
+		[sys.executable, "serve.py", "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port), "--worker-base-port", str(port + 1)],
+		cwd=ROOT,
+		env=env,
+	)
+	until = time.monotonic() + 60
+	while time.monotonic() < until:
+		try:
+			if len(requests.get(f"http://127.0.0.1:{port}/admin/workers", timeout=1).json()["workers"]) == workers:
+				return process
+		except (requests.RequestException, ValueError, KeyError):
+			pass
+		time.sleep(0.2)
+	process.terminate()
+	raise RuntimeError(f"serve.py with {workers} workers did not start")
+
+
+async def client(url: str, turns: int) -> None:
+	session_id = str(uuid.uuid4())
+	async with websockets.connect(url) as ws:
+		for i in range(turns):
+			await ws.send(json.dumps({"session_id": session_id, "message": f"turn {i}", "message_type": "chat"}))
+			reply = json.loads(await ws.recv())
+			if not reply.get("success"):
+				raise RuntimeError(reply.get("error"))
+
+
+async def drive(url: str, clients: int, turns: int) -> float:
+	started = time.perf_counter()
+	await asyncio.gather(*(client(url, turns) for _ in range(clients)))
+	return time.perf_counter() - started
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+	parser.add_argument("--clients", type=int, default=32)
+	parser.add_argument("--turns", type=int, default=20)
+	parser.add_argument("--cpu-ms", type=float, default=20.0)
+	parser.add_argument("--latency-ms", type=float, default=50.0)
+	parser.add_argument("--port", type=int, default=8100)
+	args = parser.parse_args()
+
+	total = args.clients * args.turns
+	print(f"{args.clients} clients x {args.turns} turns, stub model cpu={args.cpu_ms:g}ms latency={args.latency_ms:g}ms")
+	print(f"{'workers':>8} {'seconds':>9} {'turns/s':>9} {'speedup':>8}")
+	baseline = None
+	for workers in args.workers:
+		process = start_server(workers, args.port, args.cpu_ms, args.latency_ms)
+		try:
+			elapsed = asyncio.run(drive(f"ws://127.0.0.1:{args.port}/ws/chat", args.clients, args.turns))
+		finally:
+			process.terminate()
+			process.wait()
+		throughput = total / elapsed
+		baseline = baseline or throughput
+		print(f"{workers:>8} {elapsed:>9.2f} {throughput:>9.1f} {throughput / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+	main()
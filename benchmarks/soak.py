@@ -0,0 +1,218 @@
+"""Soak test: many connect/chat/disconnect cycles and webhook calls against the real app.
+
+The FastAPI app from main.py is driven in-process through raw ASGI calls, on top of the
+offline stub model (AGENT_MODEL_PROVIDER=stub) and a small in-memory stand-in for
+MongoDB, so no network, database or API key is needed. tracemalloc snapshots are taken
+at intervals; the allocation sites that grew the most are reported at the end.
+
+Fails (exit code 1) when the memory retained per live session exceeds
+--max-bytes-per-session, or when connections are still registered after every client
+has disconnected.
+
+  python benchmarks/soak.py --cycles 5000 --turns 3 --snapshot-every 500
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tracemalloc
+import uuid
+from contextlib import redirect_stdout
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+# Must be set before the app is imported: lib.agent reads them at import time
+os.environ["AGENT_MODEL_PROVIDER"] = "stub"
+os.environ.setdefault("STUB_MODEL_LATENCY_MS", "0")
+os.environ["API_KEY"] = ""
+
+
+class StubCollection:
+	"""In-memory collection implementing only the operations the soak scenarios reach."""
+
+	def __init__(self):
+		self.docs: Dict[Any, Dict[str, Any]] = {}
+
+	def find_one(self, query: Dict[str, Any], *args, **kwargs):
+		doc = self.docs.get(query.get("_id"))
+		return dict(doc) if doc is not None else None
+
+	def insert_one(self, doc: Dict[str, Any]):
+		from bson import ObjectId
+		doc.setdefault("_id", ObjectId())
+		self.docs[doc["_id"]] = dict(doc)
+		return SimpleNamespace(inserted_id=doc["_id"])
+
+
+class StubDB:
+	def __init__(self):
+		self._collections: Dict[str, StubCollection] = {}
+
+	def __getattr__(self, name: str) -> StubCollection:
+		if name.startswith("_"):
+			raise AttributeError(name)
+		return self._collections.setdefault(name, StubCollection())
+
+	def __getitem__(self, name: str) -> StubCollection:
+		return getattr(self, name)
+
+
+def _websocket_scope() -> Dict[str, Any]:
+	return {
+		"type": "websocket", "asgi": {"version": "3.0"}, "scheme": "ws", "http_version": "1.1",
+		"path": "/ws/chat", "raw_path": b"/ws/chat", "root_path": "", "query_string": b"",
+		"headers": [], "client": ("127.0.0.1", 50000), "server": ("soak", 80), "subprotocols": [],
+	}
+
+
+def _http_scope(method: str, path: str) -> Dict[str, Any]:
+	return {
+		"type": "http", "asgi": {"version": "3.0"}, "scheme": "http", "http_version": "1.1",
+		"method": method, "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+		"headers": [(b"content-type", b"application/json")], "client": ("127.0.0.1", 50000), "server": ("soak", 80),
+	}
+
+
+async def chat_cycle(app, turns: int, clear: bool) -> None:
+	"""Connect, chat for `turns` turns (optionally clearing the session), disconnect."""
+	session_id = str(uuid.uuid4())
+	inbox: asyncio.Queue = asyncio.Queue()
+	replies: asyncio.Queue = asyncio.Queue()
+
+	async def send(message):
+		if message["type"] == "websocket.send":
+			replies.put_nowait(message["text"])
+
+	inbox.put_nowait({"type": "websocket.connect"})
+	server = asyncio.create_task(app(_websocket_scope(), inbox.get, send))
+	messages = [f"Soak turn {i}: list my projects" for i in range(turns)] + (["/clear"] if clear else [])
+	for text in messages:
+		inbox.put_nowait({"type": "websocket.receive", "text": json.dumps({"session_id": session_id, "message": text})})
+		reply = json.loads(await asyncio.wait_for(replies.get(), timeout=10))
+		if not reply.get("success"):
+			raise RuntimeError(f"Chat turn failed: {reply.get('error')}")
+	inbox.put_nowait({"type": "websocket.disconnect", "code": 1000})
+	await asyncio.wait_for(server, timeout=10)
+
+
+async def webhook_call(app, meeting_id: str) -> None:
+	body = [{"type": "http.request", "body": json.dumps({"meeting_id": meeting_id}).encode(), "more_body": False}]
+	status: List[int] = []
+
+	async def receive():
+		return body.pop() if body else {"type": "http.disconnect"}
+
+	async def send(message):
+		if message["type"] == "http.response.start":
+			status.append(message["status"])
+
+	await app(_http_scope("POST", "/webhook"), receive, send)
+	if status != [200]:
+		raise RuntimeError(f"Webhook returned {status}")
+
+
+def report(*values) -> None:
+	# stdout is redirected to /dev/null while the app runs
+	print(*values, file=sys.__stdout__, flush=True)
+
+
+def _state_counts() -> Tuple[int, int, int]:
+	from lib.agent import conversation_store
+	from lib.ws_manager import manager as ws_manager
+	return (
+		len(conversation_store),
+		sum(len(history) for history in conversation_store.values()),
+		len(ws_manager.active_connections),
+	)
+
+
+async def soak(args) -> int:
+	import lib.mongo
+	from main import app
+
+	db = StubDB()
+	lib.mongo.get_db = lambda: db
+	meeting_id = str(db.meetings.insert_one({
+		"title": "Soak meeting",
+		"attendees": ["alice", "bob"],
+		"summary": {"short_summary": "Discussed the soak test."},
+	}).inserted_id)
+
+	async def cycle(i: int) -> None:
+		await chat_cycle(app, args.turns, clear=args.clear_every and i % args.clear_every == 0)
+		if args.webhook_every and i % args.webhook_every == 0:
+			await webhook_call(app, meeting_id)
+
+	# Warm up lazily created state (middleware stack, agent/tool schemas, caches)
+	for i in range(1, args.warmup + 1):
+		await cycle(i)
+
+	filters = [
+		tracemalloc.Filter(False, tracemalloc.__file__),
+		tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+		tracemalloc.Filter(False, "<unknown>"),
+	]
+	tracemalloc.start(args.frames)
+	baseline = tracemalloc.take_snapshot().filter_traces(filters)
+	base_bytes = tracemalloc.get_traced_memory()[0]
+	base_sessions = _state_counts()[0]
+
+	report(f"{'cycle':>7} {'sessions':>9} {'messages':>9} {'conns':>6} {'traced KB':>10} {'growth KB':>10}")
+	snapshot = baseline
+	for i in range(1, args.cycles + 1):
+		await cycle(args.warmup + i)
+		if i % args.snapshot_every == 0 or i == args.cycles:
+			snapshot = tracemalloc.take_snapshot().filter_traces(filters)
+			current = tracemalloc.get_traced_memory()[0]
+			sessions, messages, connections = _state_counts()
+			report(f"{i:>7} {sessions:>9} {messages:>9} {connections:>6} {current // 1024:>10} {(current - base_bytes) // 1024:>10}")
+
+	growth = tracemalloc.get_traced_memory()[0] - base_bytes
+	tracemalloc.stop()
+	sessions, messages, connections = _state_counts()
+	new_sessions = max(1, sessions - base_sessions)
+	per_session = growth / new_sessions
+
+	report(f"\nTop {args.top} growing allocation sites since the baseline:")
+	for stat in snapshot.compare_to(baseline, "lineno")[:args.top]:
+		report(f"  {stat}")
+
+	report(f"\nretained growth {growth // 1024} KB over {new_sessions} live sessions = {per_session:.0f} bytes/session (limit {args.max_bytes_per_session})")
+	failures = []
+	if per_session > args.max_bytes_per_session:
+		failures.append(f"memory per session {per_session:.0f} B exceeds {args.max_bytes_per_session} B")
+	if connections:
+		failures.append(f"{connections} connections still registered after all clients disconnected")
+	for failure in failures:
+		report(f"FAIL: {failure}")
+	if not failures:
+		report("OK")
+	return 1 if failures else 0
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--cycles", type=int, default=5000, help="connect/chat/disconnect cycles")
+	parser.add_argument("--turns", type=int, default=3, help="chat turns per cycle")
+	parser.add_argument("--clear-every", type=int, default=10, help="clear the session in every Nth cycle (0: never)")
+	parser.add_argument("--webhook-every", type=int, default=5, help="call /webhook every Nth cycle (0: never)")
+	parser.add_argument("--warmup", type=int, default=50, help="cycles run before the baseline snapshot")
+	parser.add_argument("--snapshot-every", type=int, default=500)
+	parser.add_argument("--frames", type=int, default=1, help="traceback depth recorded by tracemalloc")
+	parser.add_argument("--top", type=int, default=15, help="allocation sites to report")
+	parser.add_argument("--max-bytes-per-session", type=int, default=32768)
+	args = parser.parse_args()
+
+	# The app prints every agent reply; keep that out of the report (and out of memory)
+	with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+		code = asyncio.run(soak(args))
+	sys.exit(code)
+
+
+if __name__ == "__main__":
+	main()
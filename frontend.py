@@ -87,6 +87,9 @@ REQUEST_TIMEOUT = st.sidebar.slider(
     value=30,
     help="How long to wait for agent response"
 )
+# Deadline sent to the server: a little shorter than our own wait, so its
+# timed_out/partial reply still arrives before we give up
+SERVER_TIMEOUT = max(1, REQUEST_TIMEOUT - 2)
 
 st.sidebar.markdown("---")
 st.sidebar.markdown(f"**Session ID:** `{st.session_state.session_id[:8]}...`")
@@ -100,7 +103,8 @@ if st.sidebar.button("Clear Chat", type="secondary"):
         "message": "/clear",
         "timestamp": datetime.now().isoformat(),
         "user_id": "streamlit_user",
-        "message_type": "clear"
+        "message_type": "clear",
+        "timeout": SERVER_TIMEOUT
     }
     try:
         # Send clear command via WebSocket
@@ -160,7 +164,9 @@ if prompt := st.chat_input("Type your message here..."):
         "message": prompt,
         "timestamp": datetime.now().isoformat(),
         "user_id": "streamlit_user",
-        "message_type": "chat"
+        "message_type": "chat",
+        # Let the server stop working on the turn once we stop waiting for it
+        "timeout": SERVER_TIMEOUT
     }
     
     # Show loading spinner and send WebSocket message
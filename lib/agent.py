@@ -1,12 +1,27 @@
 from agents import Agent, Runner, TResponseInputItem
-from datetime import datetime
-from typing import List, Dict, Any
-from lib.tools import create_project, get_meeting_details, get_meetings_list, communicate_with_task_manager, get_projects_list, update_meeting_project_id
+import asyncio
+import os
+import time
+from typing import List, Dict, Any, Optional
+from lib.stub_model import get_run_config
+from lib.deadline import DeadlineExceeded, current_deadline, run_with_deadline
+from lib.history import SessionHistory
+from lib.mongo import mongo_get_data_version
+from lib.response_cache import UNVERSIONED_TOOLS, ResponseCache
+from lib.serialization import dumps
+from lib.tiers import TierConfig, TieredChat, TieredMeetingCategoriser
+from lib.tools import create_project, get_meeting_details, get_meetings_list, communicate_with_task_manager, get_projects_list, update_meeting_project_id, get_project_overview
 
 
 # In-memory per-session conversation history.
-# Key: session_id -> list of message dicts {role, content, timestamp}
-conversation_store: Dict[str, List[Dict[str, Any]]] = {}
+# Key: session_id -> SessionHistory (lib/history.py)
+conversation_store: Dict[str, SessionHistory] = {}
+
+# None unless AGENT_MODEL_PROVIDER=stub selects the offline provider (lib/stub_model.py)
+run_config = get_run_config()
+
+# Answer cache for read-only questions; None unless RESPONSE_CACHE=1 (lib/response_cache.py)
+response_cache = ResponseCache.from_env()
 
 chat_agent = Agent(
   name="Chat Agent",
@@ -19,16 +34,62 @@ chat_agent = Agent(
     update_meeting_project_id,
     communicate_with_task_manager,
     create_project,
-    get_projects_list
+    get_projects_list,
+    get_project_overview
   ]
 )
 
-def _now_iso() -> str:
-  return datetime.utcnow().isoformat() + "Z"
+# Small-model triage with escalation to the large model; None unless
+# CHAT_TRIAGE_MODEL / MEETING_TRIAGE_MODEL are set (lib/tiers.py)
+chat_tiers = TierConfig.from_env("CHAT", threshold=0.7)
+tiered_chat = TieredChat(chat_agent, chat_tiers) if chat_tiers is not None else None
+meeting_tiers = TierConfig.from_env("MEETING", threshold=0.8)
+tiered_meetings = TieredMeetingCategoriser(meeting_tiers) if meeting_tiers is not None else None
+
+def _data_version() -> Optional[int]:
+  try:
+    return mongo_get_data_version()
+  except DeadlineExceeded:
+    raise
+  except Exception as e:
+    print(f"Could not read data version, bypassing response cache: {e}")
+    return None
+
+
+def _data_version_unchanged(data_version: int) -> bool:
+  """Post-run cache check. The answer is already final, so any failure here (the
+  deadline passing included) only means "don't cache"."""
+  try:
+    return _data_version() == data_version
+  except DeadlineExceeded:
+    return False
+
 
+def get_history(session_id: str) -> SessionHistory:
+  history = conversation_store.get(session_id)
+  if history is None:
+    history = conversation_store[session_id] = SessionHistory()
+  return history
 
-def get_history(session_id: str) -> List[Dict[str, Any]]:
-  return conversation_store.setdefault(session_id, [])
+
+def export_history(session_id: str, pop: bool = False) -> Dict[str, Any]:
+  """Return a JSON-friendly copy of a session's state (removing it when `pop` is set):
+  `{"history": [...], "cache_opt_out": bool}`.
+
+  Used to hand a session over to another worker in multi-worker mode (see lib/gateway.py).
+  """
+  history = conversation_store.pop(session_id, None) if pop else conversation_store.get(session_id)
+  opted_out = response_cache is not None and session_id in response_cache.opted_out
+  if pop and opted_out:
+    response_cache.set_opt_out(session_id, False)
+  return {"history": history.to_dicts() if history is not None else [], "cache_opt_out": opted_out}
+
+
+def import_history(session_id: str, entries: List[Dict[str, Any]], cache_opt_out: bool = False) -> None:
+  """Replace a session's state with what `export_history` produced."""
+  conversation_store[session_id] = SessionHistory.from_dicts(entries)
+  if response_cache is not None:
+    response_cache.set_opt_out(session_id, cache_opt_out)
 
 
 async def handle_chat_message(message: str, session_id: str):
@@ -41,38 +102,38 @@ async def handle_chat_message(message: str, session_id: str):
 
   history = get_history(session_id)
 
-  # Format history as TResponseInputItem
-  formatted_history = [
-    {"role": entry["role"], "content": entry["content"]}
-    for entry in history
-  ]
-
-  # Append the user message to history
-  user_entry = {"role": "user", "content": message, "timestamp": _now_iso()}
-  history.append(user_entry)
-
-
-
-  # Format history into TResponseInputItem-compatible items before calling Runner.run
-  def _to_input_items(history_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    items: List[Dict[str, Any]] = []
-    for entry in history_list:
-      role = entry.get("role", "user")
-      # Map roles to the allowed set: user, assistant, system, developer
-      if role not in ("user", "assistant", "system", "developer"):
-        role = "user"
-      items.append({
-        "type": "message",
-        "role": role,
-        "content": entry.get("content", "")
-      })
-    return items
-
-  input_items = _to_input_items(history)
-
+  # Append the user message to history; history.items is already the
+  # TResponseInputItem list for Runner.run (which copies its input), so nothing
+  # is rebuilt per turn
+  history.append("user", message)
+  input_items = history.items
+
+  # Read-only questions can be answered from the cache while the data is unchanged.
+  # Only a session's first message: later answers may draw on (and quote) its history,
+  # which must never be served to another session
+  data_version = None
+  if response_cache is not None and len(history) == 1 and response_cache.applies_to(session_id, message):
+    data_version = _data_version()
+    cached = response_cache.get(message, data_version) if data_version is not None else None
+    if cached is not None:
+      history.append("assistant", cached)
+      return cached
+
+  started = time.perf_counter()
+  # Tools run by this turn are recorded on its deadline (see lib.deadline.with_deadline)
+  deadline = current_deadline()
+  tools_before = len(deadline.completed_tools) if deadline is not None else 0
+  failures_before = len(deadline.failures) if deadline is not None else 0
   try:
-    # Pass the typed input_items list to Runner.run
-    response = await Runner.run(chat_agent, input_items)
+    # Pass the typed input_items list to Runner.run; the run is cancelled when the
+    # turn's deadline (see lib.deadline) passes
+    if tiered_chat is not None:
+      response = await run_with_deadline(tiered_chat.run(input_items, run_config=run_config))
+    else:
+      response = await run_with_deadline(Runner.run(chat_agent, input_items, run_config=run_config))
+  except DeadlineExceeded:
+    # Let the caller report the timeout; the user message stays in history
+    raise
   except Exception as e:
     # On agent error, return a friendly message and do not remove history
     return f"Agent error: {str(e)}"
@@ -80,8 +141,18 @@ async def handle_chat_message(message: str, session_id: str):
   assistant_text = response.final_output if (response and getattr(response, "final_output", None)) else ""
 
   # Append assistant reply to history
-  assistant_entry = {"role": "assistant", "content": assistant_text, "timestamp": _now_iso()}
-  history.append(assistant_entry)
+  history.append("assistant", assistant_text)
+
+  # Only cache the answer if the run really was read-only (no writes happened meanwhile),
+  # only used data the version covers (task manager data is not in MongoDB) and did
+  # not rest on a failed tool call (e.g. "no meetings" after a transient error)
+  reliable = (
+    deadline is not None
+    and not UNVERSIONED_TOOLS.intersection(deadline.completed_tools[tools_before:])
+    and len(deadline.failures) == failures_before
+  )
+  if data_version is not None and assistant_text and reliable and _data_version_unchanged(data_version):
+    response_cache.put(message, data_version, assistant_text, time.perf_counter() - started)
 
   return assistant_text
 
@@ -104,6 +175,36 @@ async def handle_new_meeting_record(message: str) -> str:
   )
 
   # Process the meeting record using the meeting_processor_agent
-  response = await Runner.run(meeting_processor_agent, [{"type": "message", "role": "user", "content": message}])
+  response = await run_with_deadline(Runner.run(meeting_processor_agent, [{"type": "message", "role": "user", "content": message}], run_config=run_config))
+
+  return response.final_output if response and getattr(response, "final_output", None) else ""
+
+
+async def categorise_meeting(meeting: Dict[str, Any]) -> str:
+  """Ask the meeting processor agent to assign a (serialised) meeting to a project."""
+  if tiered_meetings is not None:
+    return await run_with_deadline(tiered_meetings.categorise(meeting, run_config=run_config))
+  return await handle_new_meeting_record("Categorise the following meeting based on the content and assign it a meeting ID in the database.\n " + dumps(meeting))
 
-  return response.final_output if response and getattr(response, "final_output", None) else ""
\ No newline at end of file
+
+transcript_summariser_agent = Agent(
+  name="Transcript Summariser Agent",
+  instructions="""
+  You summarise meeting transcripts. Reply with a short plain-text summary of at most a few sentences covering the topics, decisions, action items, owners, dates and projects mentioned. Do not add any commentary.
+  """,
+)
+
+# Upper bound on a stored summary, whatever the model returns
+SUMMARY_MAX_CHARS = 1200
+# Seconds one summariser call may take; ingestion waits on it while reading the upload
+SUMMARY_TIMEOUT = float(os.getenv("INGEST_SUMMARY_TIMEOUT", "60"))
+
+
+async def summarise_text(text: str, task: str = "Summarise this part of a meeting transcript:") -> str:
+  """Summarise `text` with the transcript summariser agent (asyncio.TimeoutError after SUMMARY_TIMEOUT)."""
+  response = await asyncio.wait_for(
+    Runner.run(transcript_summariser_agent, [{"type": "message", "role": "user", "content": f"{task}\n\n{text}"}], run_config=run_config),
+    timeout=SUMMARY_TIMEOUT,
+  )
+  summary = response.final_output if response and getattr(response, "final_output", None) else ""
+  return summary.strip()[:SUMMARY_MAX_CHARS]
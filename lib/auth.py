@@ -0,0 +1,10 @@
+import os
+from fastapi import HTTPException
+from starlette.status import HTTP_403_FORBIDDEN
+
+
+def check_api_key(x_api_key: str | None):
+    """Reject the request unless it carries the configured API_KEY (no-op when unset)."""
+    API_KEY = os.getenv("API_KEY")
+    if API_KEY and x_api_key != API_KEY:
+        raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail="Invalid API Key")
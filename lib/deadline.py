@@ -0,0 +1,149 @@
+import asyncio
+import contextvars
+import functools
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Dict, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Budget applied to a chat turn / webhook job when the caller does not send one,
+# and the upper bound we accept from clients.
+DEFAULT_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT_SECONDS", "60"))
+MAX_TIMEOUT = float(os.getenv("MAX_REQUEST_TIMEOUT_SECONDS", "300"))
+
+
+class DeadlineExceeded(TimeoutError):
+	"""Raised when work is attempted (or still running) after its deadline."""
+
+
+class Deadline:
+	"""An absolute point in time by which a unit of work (a chat turn or webhook job) must finish.
+
+	The deadline also records the tools that completed before it expired so a timed out
+	turn can still report what it managed to do, and the tool calls (or queries) that
+	failed, so an answer built on them is not cached.
+	"""
+
+	def __init__(self, timeout: float):
+		self.timeout = timeout
+		self.started_at = time.monotonic()
+		self.expires_at = self.started_at + timeout
+		self.completed_tools: List[str] = []
+		self.failures: List[str] = []
+
+	def remaining(self) -> float:
+		return max(0.0, self.expires_at - time.monotonic())
+
+	def expired(self) -> bool:
+		return time.monotonic() >= self.expires_at
+
+	def elapsed_ms(self) -> int:
+		return int((time.monotonic() - self.started_at) * 1000)
+
+	def check(self, operation: str = "operation") -> None:
+		"""Raise DeadlineExceeded if the deadline has already passed."""
+		if self.expired():
+			raise DeadlineExceeded(f"Deadline of {self.timeout:g}s exceeded before {operation}")
+
+	def record_failure(self, operation: str) -> None:
+		self.failures.append(operation)
+
+	def report(self) -> Dict[str, Any]:
+		"""Structured summary of the work done under this deadline."""
+		return {
+			"timeout": self.timeout,
+			"elapsed_ms": self.elapsed_ms(),
+			"completed_tools": list(self.completed_tools),
+			"failures": list(self.failures),
+		}
+
+
+_current_deadline: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+	"""Return the deadline of the request being handled in this context, if any."""
+	return _current_deadline.get()
+
+
+def resolve_timeout(requested: Any) -> float:
+	"""Clamp a client supplied timeout (seconds) to the server's accepted range."""
+	try:
+		seconds = float(requested)
+	except (TypeError, ValueError):
+		return DEFAULT_TIMEOUT
+	if seconds <= 0:
+		return DEFAULT_TIMEOUT
+	return min(seconds, MAX_TIMEOUT)
+
+
+def remaining_or(default: float) -> float:
+	"""Seconds left on the current deadline, or `default` when no deadline is set."""
+	deadline = current_deadline()
+	if deadline is None:
+		return default
+	deadline.check()
+	return deadline.remaining()
+
+
+@contextmanager
+def deadline_scope(timeout: Any) -> Iterator[Deadline]:
+	"""Make a new deadline current for everything awaited inside the block.
+
+	Tasks created inside the block (the agent run, its tool calls) copy the context
+	and therefore see the same deadline.
+	"""
+	deadline = Deadline(resolve_timeout(timeout))
+	token = _current_deadline.set(deadline)
+	try:
+		yield deadline
+	finally:
+		_current_deadline.reset(token)
+
+
+async def run_with_deadline(awaitable: Awaitable[T]) -> T:
+	"""Await `awaitable`, cancelling it if the current deadline passes first."""
+	deadline = current_deadline()
+	if deadline is None:
+		return await awaitable
+	try:
+		return await asyncio.wait_for(awaitable, timeout=deadline.remaining())
+	except asyncio.TimeoutError as e:
+		raise DeadlineExceeded(f"Deadline of {deadline.timeout:g}s exceeded") from e
+
+
+def with_deadline(func):
+	"""Decorator for async function tools: refuse to start once the deadline has passed
+	and record completed and failed calls on the current deadline."""
+
+	@functools.wraps(func)
+	async def wrapper(*args, **kwargs):
+		deadline = current_deadline()
+		if deadline is not None:
+			deadline.check(func.__name__)
+		try:
+			result = await func(*args, **kwargs)
+		except Exception:
+			# The SDK turns the exception into an error message for the model
+			if deadline is not None:
+				deadline.record_failure(func.__name__)
+			raise
+		if deadline is not None:
+			deadline.completed_tools.append(func.__name__)
+		return result
+
+	return wrapper
+
+
+__all__ = [
+	"Deadline",
+	"DeadlineExceeded",
+	"current_deadline",
+	"deadline_scope",
+	"remaining_or",
+	"resolve_timeout",
+	"run_with_deadline",
+	"with_deadline",
+]
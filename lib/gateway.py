@@ -0,0 +1,450 @@
+import asyncio
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+import httpx
+import requests
+import websockets
+from fastapi import FastAPI, Header, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.status import HTTP_403_FORBIDDEN
+
+from lib.deadline import MAX_TIMEOUT
+from lib.hash_ring import HashRing
+from lib.serialization import dumps
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# How long a worker being removed (or a session being moved) may take to finish the
+# turns already relayed to it; a turn cannot outlive the longest accepted deadline
+DRAIN_TIMEOUT = float(os.getenv("GATEWAY_DRAIN_TIMEOUT_SECONDS", str(MAX_TIMEOUT + 5)))
+# Sessions idle for longer are forgotten by the front process
+SESSION_TTL = float(os.getenv("GATEWAY_SESSION_TTL_SECONDS", "86400"))
+# Longest wait for a worker's next read/write while proxying plain HTTP (e.g. an ingest
+# upload, whose response comes after the transcript has been summarised)
+UPSTREAM_TIMEOUT = httpx.Timeout(float(os.getenv("GATEWAY_UPSTREAM_TIMEOUT_SECONDS", str(MAX_TIMEOUT + 5))), connect=5.0)
+
+
+class Worker:
+	"""A `uvicorn main:app` process serving the sessions the ring assigns to it."""
+
+	def __init__(self, name: str, host: str, port: int):
+		self.name = name
+		self.host = host
+		self.port = port
+		self.process: Optional[subprocess.Popen] = None
+
+	@property
+	def http_url(self) -> str:
+		return f"http://{self.host}:{self.port}"
+
+	@property
+	def ws_url(self) -> str:
+		return f"ws://{self.host}:{self.port}/ws/chat"
+
+	def start(self) -> None:
+		self.process = subprocess.Popen(
+			[sys.executable, "-m", "uvicorn", "main:app", "--host", self.host, "--port", str(self.port), "--log-level", "warning"],
+			cwd=ROOT,
+			env=os.environ.copy(),
+		)
+
+	def alive(self) -> bool:
+		return self.process is not None and self.process.poll() is None
+
+	def wait_ready(self, timeout: float = 30.0) -> None:
+		until = time.monotonic() + timeout
+		while time.monotonic() < until:
+			if not self.alive():
+				raise RuntimeError(f"Worker {self.name} exited during startup")
+			try:
+				if requests.get(self.http_url + "/internal/health", timeout=0.5).ok:
+					return
+			except requests.RequestException:
+				pass
+			time.sleep(0.1)
+		raise RuntimeError(f"Worker {self.name} did not become ready within {timeout:g}s")
+
+	def stop(self, timeout: float = 10.0) -> None:
+		if not self.alive():
+			return
+		self.process.terminate()
+		try:
+			self.process.wait(timeout)
+		except subprocess.TimeoutExpired:
+			self.process.kill()
+
+
+class WorkerPool:
+	"""Worker processes plus the consistent hash ring that assigns sessions to them.
+
+	Conversation history stays in the memory of the worker that owns a session. When the
+	ring changes, a session's history is handed over to its new owner: lazily on its next
+	turn when a worker is added, eagerly for every session of a worker being removed.
+	"""
+
+	def __init__(self, host: str = "127.0.0.1", base_port: int = 9000, replicas: int = 100):
+		self.host = host
+		self.base_port = base_port
+		self.workers: Dict[str, Worker] = {}
+		self.ring = HashRing(replicas=replicas)
+		# session_id -> name of the worker currently holding its history
+		self.placement: Dict[str, str] = {}
+		# session_id -> time of its last turn, least recently used first
+		self._last_seen: "OrderedDict[str, float]" = OrderedDict()
+		# Turns being relayed, per worker name and per session id
+		self._worker_turns: Dict[str, int] = {}
+		self._session_turns: Dict[str, int] = {}
+		self._turn_done = asyncio.Condition()
+		self._indexes = itertools.count()
+		self._round_robin = itertools.count()
+		self._lock = asyncio.Lock()
+		self.api_key = os.getenv("API_KEY")
+
+	def _headers(self) -> Dict[str, str]:
+		return {"x-api-key": self.api_key} if self.api_key else {}
+
+	async def add_worker(self) -> Worker:
+		index = next(self._indexes)
+		worker = Worker(f"worker-{index}", self.host, self.base_port + index)
+		worker.start()
+		try:
+			await asyncio.to_thread(worker.wait_ready)
+		except Exception:
+			worker.stop()
+			raise
+		self.workers[worker.name] = worker
+		# Sessions the new worker now owns move over on their next turn (see route)
+		self.ring.add(worker.name)
+		return worker
+
+	async def remove_worker(self, name: str) -> int:
+		"""Drain a worker: stop routing to it, let its in-flight turns finish, hand each
+		of its sessions to the new owner, then stop it.
+
+		Returns the number of sessions moved.
+		"""
+		worker = self.workers[name]
+		async with self._lock:
+			self.ring.remove(name)
+		# New turns now go to the other workers (moving their session first, see route)
+		if not await self._wait_until(lambda: not self._worker_turns.get(name)):
+			print(f"{name} still has turns in flight after {DRAIN_TIMEOUT:g}s; stopping it anyway")
+		moved = 0
+		async with self._lock:
+			for session_id, holder in list(self.placement.items()):
+				if holder != name:
+					continue
+				target = self.workers[self.ring.get(session_id)]
+				await self._move(session_id, worker, target)
+				moved += 1
+			self.workers.pop(name, None)
+		await asyncio.to_thread(worker.stop)
+		return moved
+
+	async def route(self, session_id: str) -> Worker:
+		"""Return the worker owning `session_id`, moving its history there first if needed."""
+		if not len(self.ring):
+			raise RuntimeError("No workers available")
+		holder = self.placement.get(session_id)
+		if holder is not None and holder != self.ring.get(session_id):
+			# Another connection may still have a turn of this session running on the old
+			# worker; moving now would lose the reply it is about to append. No new turn
+			# can start there, since the ring no longer points at it.
+			await self._wait_until(lambda: not self._session_turns.get(session_id))
+			async with self._lock:
+				holder = self.placement.get(session_id)
+				target = self.workers[self.ring.get(session_id)]
+				if holder in self.workers and holder != target.name:
+					await self._move(session_id, self.workers[holder], target)
+		name = self.ring.get(session_id)
+		self.placement[session_id] = name
+		self._last_seen[session_id] = time.monotonic()
+		self._last_seen.move_to_end(session_id)
+		return self.workers[name]
+
+	@asynccontextmanager
+	async def turn(self, session_id: str) -> AsyncIterator[Worker]:
+		"""Route a turn of `session_id` and count it as in flight on its worker until the block exits."""
+		worker = await self.route(session_id)
+		name = worker.name
+		self._worker_turns[name] = self._worker_turns.get(name, 0) + 1
+		self._session_turns[session_id] = self._session_turns.get(session_id, 0) + 1
+		try:
+			yield worker
+		finally:
+			for counts, key in ((self._worker_turns, name), (self._session_turns, session_id)):
+				counts[key] -= 1
+				if not counts[key]:
+					del counts[key]
+			async with self._turn_done:
+				self._turn_done.notify_all()
+
+	async def _wait_until(self, predicate: Callable[[], bool], timeout: float = DRAIN_TIMEOUT) -> bool:
+		"""Wait until `predicate` holds after a turn finishes; False if `timeout` passes first."""
+		async with self._turn_done:
+			try:
+				await asyncio.wait_for(self._turn_done.wait_for(predicate), timeout)
+			except asyncio.TimeoutError:
+				return False
+		return True
+
+	def forget(self, session_id: str) -> None:
+		self.placement.pop(session_id, None)
+		self._last_seen.pop(session_id, None)
+
+	def evict_idle(self, ttl: float = SESSION_TTL) -> int:
+		"""Forget sessions without a turn for `ttl` seconds. Returns the number forgotten.
+
+		If the ring changed while such a session was idle, its next turn starts with an
+		empty history on the new owner.
+		"""
+		cutoff = time.monotonic() - ttl
+		evicted = 0
+		while self._last_seen:
+			session_id, seen = next(iter(self._last_seen.items()))
+			if seen > cutoff:
+				break
+			if self._session_turns.get(session_id):
+				# Still in a (long) turn: treat it as active
+				self._last_seen[session_id] = time.monotonic()
+				self._last_seen.move_to_end(session_id)
+				continue
+			self.forget(session_id)
+			evicted += 1
+		return evicted
+
+	def pick(self) -> Worker:
+		"""Round-robin choice for requests that are not tied to a session."""
+		names = self.ring.nodes
+		if not names:
+			raise RuntimeError("No workers available")
+		return self.workers[names[next(self._round_robin) % len(names)]]
+
+	async def _move(self, session_id: str, source: Worker, target: Worker) -> None:
+		path = f"/internal/sessions/{quote(session_id, safe='')}"
+
+		def _transfer():
+			exported = requests.get(source.http_url + path, params={"pop": "true"}, headers=self._headers(), timeout=10)
+			exported.raise_for_status()
+			session = exported.json()
+			history, cache_opt_out = session["history"], session.get("cache_opt_out", False)
+			if history or cache_opt_out:
+				requests.put(target.http_url + path, json={"history": history, "cache_opt_out": cache_opt_out}, headers=self._headers(), timeout=10).raise_for_status()
+
+		try:
+			await asyncio.to_thread(_transfer)
+		except Exception as e:
+			print(f"Failed to move session {session_id} from {source.name} to {target.name}: {e}")
+		self.placement[session_id] = target.name
+
+	async def monitor(self, interval: float = 1.0) -> None:
+		"""Replace workers that exit unexpectedly (their sessions start with empty history)
+		and forget idle sessions."""
+		while True:
+			await asyncio.sleep(interval)
+			self.evict_idle()
+			for name, worker in list(self.workers.items()):
+				if worker.alive():
+					continue
+				print(f"Worker {name} exited with code {worker.process.returncode}; replacing it")
+				self.ring.remove(name)
+				del self.workers[name]
+				for session_id, holder in list(self.placement.items()):
+					if holder == name:
+						self.forget(session_id)
+				try:
+					await self.add_worker()
+				except Exception as e:
+					print(f"Failed to start replacement worker: {e}")
+
+	def stop_all(self) -> None:
+		for worker in self.workers.values():
+			worker.stop()
+		self.workers.clear()
+
+
+def _parse_frame(data: str) -> Tuple[Optional[str], bool]:
+	"""Return (session_id, is_clear) for a ChatMessage frame; (None, False) for plain text."""
+	try:
+		message = json.loads(data)
+	except json.JSONDecodeError:
+		return None, False
+	if not isinstance(message, dict):
+		return None, False
+	is_clear = message.get("message_type") == "clear" or str(message.get("message", "")).lower().strip() == "/clear"
+	return message.get("session_id") or None, is_clear
+
+
+def _error_frame(session_id: str, error: str) -> str:
+	# Same shape as routes.chat.ChatResponse
+	return dumps({
+		"session_id": session_id,
+		"message": "Sorry, the agent is currently unavailable.",
+		"sender": "agent",
+		"timestamp": datetime.now().isoformat(),
+		"message_type": "response",
+		"success": False,
+		"error": error,
+	})
+
+
+def create_app(workers: int, host: str = "127.0.0.1", base_port: int = 9000) -> FastAPI:
+	"""Front process app: routes `/ws/chat` sessions to workers and proxies plain HTTP."""
+	pool = WorkerPool(host=host, base_port=base_port)
+
+	http = httpx.AsyncClient(timeout=UPSTREAM_TIMEOUT)
+
+	@asynccontextmanager
+	async def lifespan(app: FastAPI):
+		await asyncio.gather(*(pool.add_worker() for _ in range(workers)))
+		monitor = asyncio.create_task(pool.monitor())
+		try:
+			yield
+		finally:
+			monitor.cancel()
+			await http.aclose()
+			pool.stop_all()
+
+	app = FastAPI(lifespan=lifespan)
+	app.state.pool = pool
+
+	def _check_api_key(x_api_key: str | None):
+		if pool.api_key and x_api_key != pool.api_key:
+			raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail="Invalid API Key")
+
+	@app.websocket("/ws/chat")
+	async def chat(websocket: WebSocket):
+		await websocket.accept()
+		api_key = websocket.headers.get("x-api-key") or websocket.query_params.get("api_key")
+		query = "?" + urlencode({"api_key": api_key}) if api_key else ""
+		# Plain text frames use a per-connection session on the worker, so pin them to one worker
+		connection_key = str(uuid.uuid4())
+		upstreams: Dict[str, Any] = {}
+
+		async def _relay(data: str, session_id: str) -> str:
+			# Counted as in flight on the worker, so draining it waits for the reply
+			async with pool.turn(session_id) as worker:
+				upstream = upstreams.get(worker.name)
+				if upstream is None:
+					upstream = upstreams[worker.name] = await websockets.connect(worker.ws_url + query)
+				try:
+					await upstream.send(data)
+					return await upstream.recv()
+				except Exception:
+					upstreams.pop(worker.name, None)
+					await upstream.close()
+					raise
+
+		# As in routes/chat.py: keep reading while a turn is relayed so that a client
+		# disconnect closes the upstream socket, which cancels the turn on the worker.
+		inbox: asyncio.Queue[str | None] = asyncio.Queue()
+
+		async def _receive():
+			try:
+				while True:
+					inbox.put_nowait(await websocket.receive_text())
+			except WebSocketDisconnect:
+				pass
+			finally:
+				inbox.put_nowait(None)
+
+		receiver = asyncio.create_task(_receive())
+		try:
+			while True:
+				data = await inbox.get()
+				if data is None:
+					break
+				session_id, is_clear = _parse_frame(data)
+				session_id = session_id or connection_key
+				relay = asyncio.create_task(_relay(data, session_id))
+				done, _ = await asyncio.wait({relay, receiver}, return_when=asyncio.FIRST_COMPLETED)
+				if relay not in done:
+					relay.cancel()
+					break
+				try:
+					reply = relay.result()
+				except Exception as e:
+					reply = _error_frame(session_id, str(e))
+				if is_clear:
+					pool.forget(session_id)
+				await websocket.send_text(reply)
+		finally:
+			receiver.cancel()
+			for upstream in upstreams.values():
+				try:
+					await upstream.close()
+				except Exception:
+					pass
+
+	@app.get("/admin/workers")
+	async def list_workers(x_api_key: str | None = Header(default=None)):
+		_check_api_key(x_api_key)
+		sessions: Dict[str, int] = {}
+		for holder in pool.placement.values():
+			sessions[holder] = sessions.get(holder, 0) + 1
+		return {"workers": [
+			{"name": w.name, "port": w.port, "pid": w.process.pid if w.process else None, "alive": w.alive(), "sessions": sessions.get(w.name, 0)}
+			for w in pool.workers.values()
+		]}
+
+	@app.post("/admin/workers")
+	async def add_worker(x_api_key: str | None = Header(default=None)):
+		_check_api_key(x_api_key)
+		worker = await pool.add_worker()
+		return {"added": worker.name, "port": worker.port}
+
+	@app.delete("/admin/workers/{name}")
+	async def remove_worker(name: str, x_api_key: str | None = Header(default=None)):
+		_check_api_key(x_api_key)
+		if name not in pool.workers:
+			raise HTTPException(status_code=404, detail="Unknown worker")
+		if len(pool.workers) == 1:
+			raise HTTPException(status_code=400, detail="Cannot remove the last worker")
+		moved = await pool.remove_worker(name)
+		return {"removed": name, "moved_sessions": moved}
+
+	@app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
+	async def proxy(path: str, request: Request):
+		"""Forward plain HTTP requests (e.g. /webhook) to a worker.
+
+		Bodies are streamed both ways, so a long upload (/meetings/ingest) is never held
+		in memory here.
+		"""
+		worker = pool.pick()
+		headers = {k: v for k, v in request.headers.items() if k.lower() not in ("host", "content-length")}
+		upstream_request = http.build_request(
+			request.method,
+			f"{worker.http_url}/{path}",
+			params=list(request.query_params.multi_items()),
+			content=request.stream(),
+			headers=headers,
+		)
+		try:
+			upstream = await http.send(upstream_request, stream=True)
+		except httpx.TimeoutException as e:
+			raise HTTPException(status_code=504, detail=f"Worker {worker.name} timed out: {e}")
+		except httpx.HTTPError as e:
+			raise HTTPException(status_code=502, detail=f"Worker {worker.name} unavailable: {e}")
+		return StreamingResponse(
+			upstream.aiter_raw(),
+			status_code=upstream.status_code,
+			media_type=upstream.headers.get("content-type"),
+			background=BackgroundTask(upstream.aclose),
+		)
+
+	return app
+
+
+__all__ = ["Worker", "WorkerPool", "create_app"]
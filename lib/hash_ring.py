@@ -0,0 +1,63 @@
+import bisect
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+
+def _hash(key: str) -> int:
+	return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+	"""Consistent hash ring mapping keys (session ids) to nodes (worker names).
+
+	Each node is placed on the ring `replicas` times so keys spread evenly, and adding
+	or removing a node only moves the keys that hash next to it (~1/N of them).
+	"""
+
+	def __init__(self, nodes: Iterable[str] = (), replicas: int = 100):
+		self.replicas = replicas
+		self._points: List[int] = []
+		self._owners: Dict[int, str] = {}
+		self._nodes: List[str] = []
+		for node in nodes:
+			self.add(node)
+
+	@property
+	def nodes(self) -> List[str]:
+		return list(self._nodes)
+
+	def __len__(self) -> int:
+		return len(self._nodes)
+
+	def __contains__(self, node: str) -> bool:
+		return node in self._nodes
+
+	def add(self, node: str) -> None:
+		if node in self._nodes:
+			return
+		self._nodes.append(node)
+		for i in range(self.replicas):
+			point = _hash(f"{node}#{i}")
+			self._owners[point] = node
+			bisect.insort(self._points, point)
+
+	def remove(self, node: str) -> None:
+		if node not in self._nodes:
+			return
+		self._nodes.remove(node)
+		for i in range(self.replicas):
+			point = _hash(f"{node}#{i}")
+			if self._owners.get(point) == node:
+				del self._owners[point]
+				index = bisect.bisect_left(self._points, point)
+				del self._points[index]
+
+	def get(self, key: str) -> Optional[str]:
+		"""Return the node that owns `key`, or None if the ring is empty."""
+		if not self._points:
+			return None
+		index = bisect.bisect(self._points, _hash(key)) % len(self._points)
+		return self._owners[self._points[index]]
+
+
+__all__ = ["HashRing"]
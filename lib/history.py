@@ -0,0 +1,69 @@
+import sys
+import time
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Roles accepted by the model input; anything else is stored as "user". Interned so
+# every stored item shares the same role string objects.
+_ROLES = {role: sys.intern(role) for role in ("user", "assistant", "system", "developer")}
+_MESSAGE = sys.intern("message")
+
+
+def _parse_timestamp(value: Any) -> float:
+	if isinstance(value, (int, float)):
+		return float(value)
+	if isinstance(value, str) and value:
+		try:
+			parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+		except ValueError:
+			return time.time()
+		if parsed.tzinfo is None:
+			parsed = parsed.replace(tzinfo=timezone.utc)
+		return parsed.timestamp()
+	return time.time()
+
+
+def _iso(timestamp: float) -> str:
+	return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+class SessionHistory:
+	"""One session's conversation, kept in the form Runner.run consumes.
+
+	Each message is stored once, as its `{"type": "message", "role", "content"}` input
+	item, so a turn appends one item instead of rebuilding the whole input list. Roles
+	are interned and timestamps are epoch seconds in a parallel array of doubles.
+	"""
+
+	__slots__ = ("items", "timestamps")
+
+	def __init__(self):
+		self.items: List[Dict[str, Any]] = []
+		self.timestamps = array("d")
+
+	def __len__(self) -> int:
+		return len(self.items)
+
+	def append(self, role: str, content: str, timestamp: Optional[float] = None) -> None:
+		self.items.append({"type": _MESSAGE, "role": _ROLES.get(role, _ROLES["user"]), "content": content})
+		self.timestamps.append(time.time() if timestamp is None else timestamp)
+
+	def entries(self) -> Iterator[Tuple[str, str, float]]:
+		"""(role, content, timestamp) for every message, oldest first."""
+		for item, timestamp in zip(self.items, self.timestamps):
+			yield item["role"], item["content"], timestamp
+
+	def to_dicts(self) -> List[Dict[str, Any]]:
+		"""JSON-friendly copy: [{role, content, timestamp (ISO 8601)}]."""
+		return [{"role": role, "content": content, "timestamp": _iso(ts)} for role, content, ts in self.entries()]
+
+	@classmethod
+	def from_dicts(cls, entries: Iterable[Dict[str, Any]]) -> "SessionHistory":
+		history = cls()
+		for entry in entries:
+			history.append(entry.get("role", "user"), entry.get("content", ""), _parse_timestamp(entry.get("timestamp")))
+		return history
+
+
+__all__ = ["SessionHistory"]
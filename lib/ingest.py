@@ -0,0 +1,118 @@
+import asyncio
+import codecs
+import os
+import traceback
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from lib.agent import summarise_text
+from lib.mongo import mongo_add_meeting_chunk, mongo_set_meeting_summary
+
+# Characters per stored chunk (each chunk is summarised on its own)
+CHUNK_CHARS = int(os.getenv("INGEST_CHUNK_CHARS", "16000"))
+# Chunks being summarised at once; reading the upload waits beyond this (backpressure)
+MAX_PENDING = int(os.getenv("INGEST_MAX_PENDING", "2"))
+# Chunk summaries kept before they are merged into one
+MAX_NOTES = int(os.getenv("INGEST_MAX_NOTES", "8"))
+
+
+class TranscriptIngestor:
+	"""Stores a streamed transcript as chunk documents and summarises it as it arrives.
+
+	Memory stays bounded whatever the transcript length: at most one partial chunk is
+	buffered, at most `max_pending` chunks are being summarised, and chunk summaries are
+	folded into at most `max_notes` notes (merged by the summariser when full). `finish`
+	turns the notes into the meeting's `summary.short_summary`.
+	"""
+
+	def __init__(
+		self,
+		meeting_id: str,
+		chunk_chars: int = CHUNK_CHARS,
+		max_pending: int = MAX_PENDING,
+		max_notes: int = MAX_NOTES,
+		summarise: Callable[..., Awaitable[str]] = summarise_text,
+	):
+		self.meeting_id = meeting_id
+		self.chunk_chars = chunk_chars
+		self.max_pending = max(1, max_pending)
+		self.max_notes = max(2, max_notes)
+		self.summarise = summarise
+		self.chunks = 0
+		self.chars = 0
+		self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+		self._buffer = ""
+		self._pending: Deque[asyncio.Task] = deque()
+		self._notes: List[str] = []
+
+	async def feed(self, data: bytes) -> None:
+		"""Add the next piece of the upload."""
+		self._buffer += self._decoder.decode(data)
+		while len(self._buffer) >= self.chunk_chars:
+			cut = self._cut_point()
+			chunk, self._buffer = self._buffer[:cut], self._buffer[cut:]
+			await self._emit(chunk)
+
+	async def finish(self) -> Dict[str, Any]:
+		"""Flush the remaining text, wait for chunk summaries and store the meeting summary."""
+		self._buffer += self._decoder.decode(b"", final=True)
+		if self._buffer.strip():
+			await self._emit(self._buffer)
+		self._buffer = ""
+		while self._pending:
+			await self._fold(await self._pending.popleft())
+
+		if len(self._notes) > 1:
+			short_summary = await self._safe_summarise("\n".join(self._notes), "Write a short summary of the whole meeting from these notes on its parts:")
+		else:
+			short_summary = self._notes[0] if self._notes else ""
+		await asyncio.to_thread(mongo_set_meeting_summary, self.meeting_id, short_summary)
+		return {"meeting_id": self.meeting_id, "chunks": self.chunks, "chars": self.chars, "short_summary": short_summary}
+
+	def cancel(self) -> None:
+		for task in self._pending:
+			task.cancel()
+		self._pending.clear()
+
+	def _cut_point(self) -> int:
+		# Prefer ending a chunk at a line break, then at a space, so words stay whole
+		window = self._buffer[:self.chunk_chars]
+		for separator in ("\n", " "):
+			index = window.rfind(separator)
+			if index > self.chunk_chars // 2:
+				return index + 1
+		return self.chunk_chars
+
+	async def _emit(self, text: str) -> None:
+		seq = self.chunks
+		self.chunks += 1
+		self.chars += len(text)
+		self._pending.append(asyncio.create_task(self._store_chunk(seq, text)))
+		if len(self._pending) >= self.max_pending:
+			await self._fold(await self._pending.popleft())
+
+	async def _store_chunk(self, seq: int, text: str) -> str:
+		summary = await self._safe_summarise(text)
+		await asyncio.to_thread(mongo_add_meeting_chunk, self.meeting_id, seq, text, summary)
+		return summary
+
+	async def _fold(self, summary: str) -> None:
+		if summary:
+			self._notes.append(summary)
+		if len(self._notes) >= self.max_notes:
+			merged = await self._safe_summarise("\n".join(self._notes), "Merge these notes on consecutive parts of a meeting into one short summary:")
+			self._notes = [merged]
+
+	async def _safe_summarise(self, text: str, task: Optional[str] = None) -> str:
+		try:
+			return await (self.summarise(text, task) if task else self.summarise(text))
+		except asyncio.TimeoutError:
+			print(f"Summarising part of meeting {self.meeting_id} timed out; using the start of the text")
+			return text[:300].strip()
+		except Exception:
+			# Keep ingesting; fall back to the start of the text
+			traceback.print_exc()
+			return text[:300].strip()
+
+
+__all__ = ["TranscriptIngestor"]
@@ -1,29 +1,60 @@
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timezone
+from datetime import datetime, timezone, date, timedelta
 from bson import ObjectId
 import os
-from pymongo import MongoClient
+from contextlib import contextmanager
+import pymongo
+from pymongo import MongoClient, ReturnDocument
+from pymongo.errors import PyMongoError
+
+from lib.deadline import DeadlineExceeded, current_deadline
+from lib.serialization import FieldPlan, as_iso, as_str, passthrough, to_jsonable
+
+_client: Optional[MongoClient] = None
 
 def get_db():
-  client = MongoClient(os.getenv('MONGO_URI'))
-  return client[os.getenv('MONGO_DB')]
-
-def _serialize_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
-	"""Convert ObjectId and datetime fields into JSON-friendly representations."""
-	if not doc:
-		return doc
-	out = dict(doc)
-	# Convert _id to id string
-	if "_id" in out:
-		out["id"] = str(out["_id"])
-		out.pop("_id", None)
-	# Convert any ObjectId fields to strings (common patterns)
-	for k, v in list(out.items()):
-		if isinstance(v, ObjectId):
-			out[k] = str(v)
-		if isinstance(v, datetime):
-			out[k] = v.isoformat()
-	return out
+  # MongoClient is thread-safe and pools connections: create it once per process
+  global _client
+  if _client is None:
+    _client = MongoClient(os.getenv('MONGO_URI'))
+  return _client[os.getenv('MONGO_DB')]
+
+@contextmanager
+def _bounded():
+	"""Bound the enclosed operations by the current request deadline, if any.
+
+	Inside `pymongo.timeout` the driver sends the remaining budget to the server as
+	`maxTimeMS` on every operation, so queries stop when the caller stops waiting.
+	Driver timeouts (ExecutionTimeout, NetworkTimeout, ...) are raised as DeadlineExceeded.
+	"""
+	deadline = current_deadline()
+	if deadline is None:
+		yield
+		return
+	deadline.check("database query")
+	try:
+		with pymongo.timeout(deadline.remaining()):
+			yield
+	except PyMongoError as e:
+		if not e.timeout:
+			raise
+		raise DeadlineExceeded(f"Database query exceeded the {deadline.timeout:g}s deadline: {e}") from e
+
+def _bump_data_version(db) -> None:
+	"""Record that data changed. Call after every write so cached answers (lib/response_cache.py) go stale."""
+	db.meta.update_one({"_id": "data_version"}, {"$inc": {"value": 1}}, upsert=True)
+
+def mongo_get_data_version() -> int:
+	"""Counter incremented on every write made through this module (shared by all processes)."""
+	db = get_db()
+	with _bounded():
+		doc = db.meta.find_one({"_id": "data_version"})
+	return int(doc["value"]) if doc else 0
+
+# Conversion plans (see lib/serialization.py) for the collections read here; fields
+# not listed are converted generically, nested BSON values included
+MEETING_PLAN = FieldPlan({"project_id": as_str, "title": passthrough, "occurred_at": as_iso, "created_at": as_iso, "updated_at": as_iso})
+PROJECT_PLAN = FieldPlan({"title": passthrough, "due_date": as_iso, "created_at": as_iso, "updated_at": as_iso})
 
 
 def mongo_get_meetings_list(limit: int = 100, filters: Optional[Dict[str, Any]] = None, sort_field: str = "occurred_at", desc: bool = True) -> List[Dict[str, Any]]:
@@ -43,26 +74,32 @@ def mongo_get_meetings_list(limit: int = 100, filters: Optional[Dict[str, Any]]
 	sort_dir = -1 if desc else 1
 
 	try:
-		cursor = db.meetings.find(query).sort(sort_field, sort_dir).limit(limit)
+		with _bounded():
+			# Only fetch what the list returns, not whole transcripts
+			docs = list(db.meetings.find(query, {"attendees": 1, "summary.short_summary": 1}).sort(sort_field, sort_dir).limit(limit))
 		results = []
-		for doc in cursor:
+		for doc in docs:
 
-			serialized_doc = _serialize_doc(doc)
-
-			summary = serialized_doc.get("summary") or {}
+			summary = doc.get("summary") or {}
 
 			info = {
-				"id": serialized_doc.get("id"),
-				"attendees": serialized_doc.get("attendees"),
+				"id": str(doc["_id"]),
+				"attendees": to_jsonable(doc.get("attendees")),
 				"short_summary": summary.get("short_summary"),
 			}
 			print("info: ", info)
 
 			results.append(info)
 		return results
+	except DeadlineExceeded:
+		# don't report a timed out query as "no meetings"
+		raise
 	except Exception as e:
-		# log and return empty list on error
+		# log and return empty list on error; the answer built on it must not be cached
 		print(f"Error fetching meetings: {e}")
+		deadline = current_deadline()
+		if deadline is not None:
+			deadline.record_failure("mongo_get_meetings_list")
 		return []
 
 
@@ -73,8 +110,9 @@ def mongo_get_meeting_by_id(meeting_id: str) -> Optional[Dict[str, Any]]:
 		oid = ObjectId(meeting_id)
 	except Exception:
 		return None
-	doc = db.meetings.find_one({"_id": oid})
-	return _serialize_doc(doc) if doc else None
+	with _bounded():
+		doc = db.meetings.find_one({"_id": oid})
+	return MEETING_PLAN.apply(doc) if doc else None
 
 def mongo_update_meeting_project_id(meeting_id: str, project_id: str) -> Any:
 	"""Update the project ID associated with a meeting."""
@@ -83,8 +121,78 @@ def mongo_update_meeting_project_id(meeting_id: str, project_id: str) -> Any:
 		oid = ObjectId(meeting_id)
 	except Exception:
 		return None
-	result = db.meetings.update_one({"_id": oid}, {"$set": {"project_id": project_id}})
-	return result.modified_count > 0
+	with _bounded():
+		previous = db.meetings.find_one_and_update(
+			{"_id": oid},
+			{"$set": {"project_id": project_id}},
+			projection=_ROLLUP_MEETING_FIELDS,
+			return_document=ReturnDocument.BEFORE,
+		)
+		if previous is None or previous.get("project_id") == project_id:
+			return False
+		_rollup_add_meeting(db, project_id, previous)
+		if previous.get("project_id"):
+			# Attendees can't be "un-added" incrementally, so recompute the old project
+			_rollup_rebuild(db, [previous["project_id"]])
+		_bump_data_version(db)
+	return True
+
+# Meeting ingestion
+#
+# Streamed transcripts (routes/meetings-ingest.py) are stored as ordered documents in
+# `meeting_chunks` ({meeting_id, seq, text, summary}); the meeting document only holds
+# metadata, ingest progress and `summary.short_summary`.
+
+_chunk_index_ready = False
+
+def mongo_create_meeting(title: Optional[str], occurred_at: datetime, attendees: List[Any]) -> str:
+	"""Create a meeting whose transcript is about to be ingested. Returns its id."""
+	global _chunk_index_ready
+	db = get_db()
+	now = datetime.now(timezone.utc)
+	with _bounded():
+		if not _chunk_index_ready:
+			db.meeting_chunks.create_index([("meeting_id", 1), ("seq", 1)], unique=True)
+			_chunk_index_ready = True
+		result = db.meetings.insert_one({
+			"title": title,
+			"occurred_at": occurred_at,
+			"attendees": attendees,
+			"summary": {"short_summary": None},
+			"ingest": {"status": "receiving", "chunks": 0, "chars": 0},
+			"created_at": now,
+			"updated_at": now,
+		})
+		_bump_data_version(db)
+	return str(result.inserted_id)
+
+def mongo_add_meeting_chunk(meeting_id: str, seq: int, text: str, summary: Optional[str]) -> None:
+	"""Store one transcript chunk with its summary and update the meeting's ingest progress."""
+	db = get_db()
+	oid = ObjectId(meeting_id)
+	with _bounded():
+		db.meeting_chunks.insert_one({"meeting_id": oid, "seq": seq, "text": text, "summary": summary, "created_at": datetime.now(timezone.utc)})
+		db.meetings.update_one({"_id": oid}, {"$inc": {"ingest.chunks": 1, "ingest.chars": len(text)}})
+		_bump_data_version(db)
+
+def mongo_set_meeting_summary(meeting_id: str, short_summary: str) -> None:
+	"""Write the final short summary (read by mongo_get_meetings_list) and mark ingestion complete."""
+	db = get_db()
+	now = datetime.now(timezone.utc)
+	with _bounded():
+		db.meetings.update_one({"_id": ObjectId(meeting_id)}, {"$set": {
+			"summary.short_summary": short_summary,
+			"summary.generated_at": now,
+			"ingest.status": "complete",
+			"updated_at": now,
+		}})
+		_bump_data_version(db)
+
+def mongo_set_meeting_ingest_failed(meeting_id: str, error: str) -> None:
+	db = get_db()
+	with _bounded():
+		db.meetings.update_one({"_id": ObjectId(meeting_id)}, {"$set": {"ingest.status": "failed", "ingest.error": error, "updated_at": datetime.now(timezone.utc)}})
+		_bump_data_version(db)
 
 # Projects
 
@@ -98,14 +206,17 @@ def mongo_create_project(title: str, due_date: Optional[str] = None, additional_
 		"created_at": datetime.now(timezone.utc),
 		"updated_at": datetime.now(timezone.utc),
 	}
-	result = db.projects.insert_one(project_doc)
-	return _serialize_doc(db.projects.find_one({"_id": result.inserted_id}))
+	with _bounded():
+		result = db.projects.insert_one(project_doc)
+		db.project_rollups.insert_one(_empty_rollup(str(result.inserted_id), title, due_date))
+		_bump_data_version(db)
+		return PROJECT_PLAN.apply(db.projects.find_one({"_id": result.inserted_id}))
 
 def mongo_get_projects_list() -> List[Dict[str, Any]]:
 	"""Fetch a list of all projects."""
 	db = get_db()
-	cursor = db.projects.find()
-	return [_serialize_doc(doc) for doc in cursor]
+	with _bounded():
+		return [PROJECT_PLAN.apply(doc) for doc in db.projects.find()]
 
 def mongo_get_project_by_id(project_id: str) -> Optional[Dict[str, Any]]:
 	"""Fetch a single project by its ObjectId string."""
@@ -114,5 +225,168 @@ def mongo_get_project_by_id(project_id: str) -> Optional[Dict[str, Any]]:
 		oid = ObjectId(project_id)
 	except Exception:
 		return None
-	doc = db.projects.find_one({"_id": oid})
-	return _serialize_doc(doc) if doc else None
\ No newline at end of file
+	with _bounded():
+		doc = db.projects.find_one({"_id": oid})
+	return PROJECT_PLAN.apply(doc) if doc else None
+
+# Project rollups
+#
+# `project_rollups` holds one precomputed summary per project (keyed by project id string)
+# so overview questions are answered with a single small query instead of listing and
+# fetching every meeting. It is kept up to date incrementally when projects are created
+# and meetings are assigned; `mongo_rebuild_project_rollups` recomputes it from scratch
+# (e.g. after meetings were assigned outside of this module).
+
+ROLLUP_RECENT_SUMMARIES = 5
+DUE_SOON_DAYS = 7
+
+_ROLLUP_MEETING_FIELDS = {"project_id": 1, "occurred_at": 1, "attendees": 1, "summary.short_summary": 1}
+
+
+def _empty_rollup(project_id: str, title: Optional[str], due_date: Optional[str]) -> Dict[str, Any]:
+	return {
+		"_id": project_id,
+		"title": title,
+		"due_date": due_date,
+		"meeting_count": 0,
+		"last_meeting_at": None,
+		"attendees": [],
+		"recent_summaries": [],
+		"updated_at": datetime.now(timezone.utc),
+	}
+
+
+def _summary_entry(meeting: Dict[str, Any]) -> Dict[str, Any]:
+	return {
+		"meeting_id": str(meeting["_id"]),
+		"occurred_at": meeting.get("occurred_at"),
+		"short_summary": (meeting.get("summary") or {}).get("short_summary"),
+	}
+
+
+def _rollup_add_meeting(db, project_id: str, meeting: Dict[str, Any]) -> None:
+	"""Fold one newly assigned meeting into its project's rollup."""
+	update: Dict[str, Any] = {
+		"$inc": {"meeting_count": 1},
+		"$addToSet": {"attendees": {"$each": list(meeting.get("attendees") or [])}},
+		"$push": {"recent_summaries": {
+			"$each": [_summary_entry(meeting)],
+			"$sort": {"occurred_at": -1},
+			"$slice": ROLLUP_RECENT_SUMMARIES,
+		}},
+		"$set": {"updated_at": datetime.now(timezone.utc)},
+	}
+	if meeting.get("occurred_at") is not None:
+		update["$max"] = {"last_meeting_at": meeting["occurred_at"]}
+	result = db.project_rollups.update_one({"_id": project_id}, update)
+	if result.matched_count == 0:
+		# No rollup yet (project predates rollups): build it from the meetings collection
+		_rollup_rebuild(db, [project_id])
+
+
+def _rollup_rebuild(db, project_ids: Optional[List[str]] = None) -> int:
+	"""Recompute rollups for `project_ids` (all projects when None). Returns the number written."""
+	projects: Dict[str, Dict[str, Any]] = {}
+	if project_ids is None:
+		project_query: Dict[str, Any] = {}
+		meeting_query: Dict[str, Any] = {"project_id": {"$nin": [None, ""]}}
+	else:
+		oids = [ObjectId(pid) for pid in project_ids if ObjectId.is_valid(pid)]
+		project_query = {"_id": {"$in": oids}}
+		meeting_query = {"project_id": {"$in": list(project_ids)}}
+	for project in db.projects.find(project_query, {"title": 1, "due_date": 1}):
+		pid = str(project["_id"])
+		projects[pid] = _empty_rollup(pid, project.get("title"), project.get("due_date"))
+
+	attendees: Dict[str, set] = {}
+	for meeting in db.meetings.find(meeting_query, _ROLLUP_MEETING_FIELDS).sort("occurred_at", -1):
+		pid = meeting["project_id"]
+		rollup = projects.setdefault(pid, _empty_rollup(pid, None, None))
+		rollup["meeting_count"] += 1
+		if rollup["last_meeting_at"] is None:
+			rollup["last_meeting_at"] = meeting.get("occurred_at")
+		for attendee in meeting.get("attendees") or []:
+			key = repr(attendee)
+			if key not in attendees.setdefault(pid, set()):
+				attendees[pid].add(key)
+				rollup["attendees"].append(attendee)
+		if len(rollup["recent_summaries"]) < ROLLUP_RECENT_SUMMARIES:
+			rollup["recent_summaries"].append(_summary_entry(meeting))
+
+	for pid, rollup in projects.items():
+		db.project_rollups.replace_one({"_id": pid}, rollup, upsert=True)
+	if project_ids is None:
+		# From now on the rollups are kept up to date incrementally
+		db.meta.update_one({"_id": "rollups_built"}, {"$set": {"at": datetime.now(timezone.utc)}}, upsert=True)
+	else:
+		# Projects that no longer exist and have no meetings
+		stale = [pid for pid in project_ids if pid not in projects]
+		if stale:
+			db.project_rollups.delete_many({"_id": {"$in": stale}})
+	return len(projects)
+
+
+def _due_status(due_date: Any, today: Optional[date] = None) -> str:
+	if not due_date:
+		return "no_due_date"
+	try:
+		due = due_date.date() if isinstance(due_date, datetime) else datetime.fromisoformat(str(due_date)).date()
+	except ValueError:
+		return "unknown"
+	today = today or datetime.now(timezone.utc).date()
+	if due < today:
+		return "overdue"
+	if due <= today + timedelta(days=DUE_SOON_DAYS):
+		return "due_soon"
+	return "on_track"
+
+
+def _format_rollup(rollup: Dict[str, Any]) -> Dict[str, Any]:
+	return {
+		"project_id": rollup["_id"],
+		"title": rollup.get("title"),
+		"due_date": rollup.get("due_date"),
+		"due_status": _due_status(rollup.get("due_date")),
+		"meeting_count": rollup.get("meeting_count", 0),
+		"last_meeting_at": as_iso(rollup.get("last_meeting_at")),
+		"attendees": to_jsonable(rollup.get("attendees", [])),
+		"recent_summaries": [
+			{"meeting_id": s.get("meeting_id"), "occurred_at": as_iso(s.get("occurred_at")), "short_summary": s.get("short_summary")}
+			for s in rollup.get("recent_summaries", [])
+		],
+	}
+
+
+_rollups_built = False
+
+def _ensure_rollups(db) -> None:
+	"""Materialise all rollups once per database (an existing database has none to start with)."""
+	global _rollups_built
+	if _rollups_built:
+		return
+	if db.meta.find_one({"_id": "rollups_built"}) is None:
+		_rollup_rebuild(db)
+	_rollups_built = True
+
+
+def mongo_get_project_overview(project_id: Optional[str] = None) -> List[Dict[str, Any]]:
+	"""Return precomputed project rollups (all projects, or just `project_id`).
+
+	Each entry has the meeting count, last meeting date, distinct attendees, latest short
+	summaries and a due-date status (overdue, due_soon, on_track, no_due_date, unknown).
+	"""
+	db = get_db()
+	query = {"_id": project_id} if project_id else {}
+	with _bounded():
+		_ensure_rollups(db)
+		rollups = list(db.project_rollups.find(query).sort("last_meeting_at", -1))
+	return [_format_rollup(r) for r in rollups]
+
+
+def mongo_rebuild_project_rollups() -> int:
+	"""Recompute every project rollup from the projects and meetings collections."""
+	db = get_db()
+	with _bounded():
+		written = _rollup_rebuild(db)
+		_bump_data_version(db)
+	return written
\ No newline at end of file
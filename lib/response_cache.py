@@ -0,0 +1,131 @@
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+
+# Words that mean the turn may change data; such turns are never cached
+_WRITE_WORDS = frozenset((
+	"create", "add", "new", "make", "update", "change", "edit", "set", "rename", "move",
+	"assign", "reassign", "unassign", "delete", "remove", "archive", "close", "complete",
+	"mark", "schedule", "cancel", "send", "tell", "ask", "delegate",
+))
+# Words that refer back to the conversation; the answer then depends on history
+_CONTEXT_WORDS = frozenset((
+	"it", "its", "that", "this", "these", "those", "them", "they", "one", "ones",
+	"above", "previous", "earlier", "same", "again", "else", "more", "also",
+))
+_READ_OPENERS = frozenset((
+	"list", "show", "get", "what", "which", "who", "when", "where", "how", "are", "is",
+	"do", "does", "give", "summarise", "summarize", "display", "find", "any",
+))
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Tools whose data lives outside MongoDB and is therefore not covered by the data
+# version; answers that used them are never cached
+UNVERSIONED_TOOLS = frozenset(("communicate_with_task_manager",))
+
+
+def normalise_query(message: str) -> str:
+	"""Lowercase, drop punctuation and collapse whitespace: "List my projects!" -> "list my projects"."""
+	return " ".join(_WORD.findall(message.lower()))
+
+
+def is_read_only(message: str) -> bool:
+	"""Heuristic: a self-contained question or lookup that does not ask for any change."""
+	words = normalise_query(message).split()
+	if not words or words[0] not in _READ_OPENERS:
+		return False
+	return not any(w in _WRITE_WORDS or w in _CONTEXT_WORDS for w in words)
+
+
+class ResponseCache:
+	"""LRU + TTL cache of agent answers to read-only questions.
+
+	Entries are keyed on the normalised question and the data version (see
+	`lib.mongo.mongo_get_data_version`), so any write to the database makes earlier
+	answers unreachable; they then age out through LRU eviction or the TTL.
+	"""
+
+	def __init__(self, max_entries: int = 1000, ttl: float = 300.0):
+		self.max_entries = max_entries
+		self.ttl = ttl
+		# (normalised query, data version) -> (answer, stored_at, seconds the answer took to produce)
+		self._entries: "OrderedDict[Tuple[str, int], Tuple[str, float, float]]" = OrderedDict()
+		# Sessions that asked not to be served cached answers
+		self.opted_out: Set[str] = set()
+		self.hits = 0
+		self.misses = 0
+		self.stores = 0
+		self.evictions = 0
+		self.expirations = 0
+		self.latency_saved = 0.0
+
+	@classmethod
+	def from_env(cls) -> Optional["ResponseCache"]:
+		"""The cache configured by RESPONSE_CACHE* environment variables, or None when disabled."""
+		if os.getenv("RESPONSE_CACHE", "").lower() not in ("1", "true", "yes", "on"):
+			return None
+		return cls(
+			max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000")),
+			ttl=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300")),
+		)
+
+	def set_opt_out(self, session_id: str, opted_out: bool) -> None:
+		if opted_out:
+			self.opted_out.add(session_id)
+		else:
+			self.opted_out.discard(session_id)
+
+	def applies_to(self, session_id: str, message: str) -> bool:
+		return session_id not in self.opted_out and is_read_only(message)
+
+	def get(self, message: str, version: int) -> Optional[str]:
+		key = (normalise_query(message), version)
+		entry = self._entries.get(key)
+		if entry is None:
+			self.misses += 1
+			return None
+		answer, stored_at, latency = entry
+		if time.monotonic() - stored_at > self.ttl:
+			del self._entries[key]
+			self.expirations += 1
+			self.misses += 1
+			return None
+		self._entries.move_to_end(key)
+		self.hits += 1
+		self.latency_saved += latency
+		return answer
+
+	def put(self, message: str, version: int, answer: str, latency: float) -> None:
+		key = (normalise_query(message), version)
+		self._entries[key] = (answer, time.monotonic(), latency)
+		self._entries.move_to_end(key)
+		self.stores += 1
+		while len(self._entries) > self.max_entries:
+			self._entries.popitem(last=False)
+			self.evictions += 1
+
+	def clear(self) -> None:
+		self._entries.clear()
+
+	def metrics(self) -> Dict[str, Any]:
+		lookups = self.hits + self.misses
+		return {
+			"entries": len(self._entries),
+			"max_entries": self.max_entries,
+			"ttl_seconds": self.ttl,
+			"hits": self.hits,
+			"misses": self.misses,
+			"hit_rate": self.hits / lookups if lookups else 0.0,
+			"stores": self.stores,
+			"evictions": self.evictions,
+			"expirations": self.expirations,
+			"latency_saved_ms": int(self.latency_saved * 1000),
+			"opted_out_sessions": len(self.opted_out),
+		}
+
+
+__all__ = ["UNVERSIONED_TOOLS", "ResponseCache", "is_read_only", "normalise_query"]
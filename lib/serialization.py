@@ -0,0 +1,128 @@
+import base64
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional
+
+from bson import Binary, Decimal128, ObjectId, Timestamp
+
+try:
+	import orjson
+except ImportError:  # listed in requirements.txt; stdlib json is the fallback
+	orjson = None
+
+
+# JSON-friendly conversion of MongoDB documents (nested BSON types included) and a
+# compact JSON encoder used for tool outputs, webhook responses and other frames.
+
+Converter = Callable[[Any], Any]
+
+_SCALARS = frozenset((str, int, float, bool, type(None)))
+
+
+def _iso(value: Any) -> str:
+	return value.isoformat()
+
+
+def _b64(value: bytes) -> str:
+	return base64.b64encode(value).decode("ascii")
+
+
+def _dict(value: Mapping) -> Dict[str, Any]:
+	return {str(k): to_jsonable(v) for k, v in value.items()}
+
+
+def _list(value: Iterable) -> list:
+	return [to_jsonable(v) for v in value]
+
+
+# Exact-type dispatch table; subclasses fall through to the isinstance checks below
+_CONVERTERS: Dict[type, Converter] = {
+	ObjectId: str,
+	datetime: _iso,
+	date: _iso,
+	Decimal128: str,
+	Decimal: str,
+	uuid.UUID: str,
+	Timestamp: lambda ts: ts.as_datetime().isoformat(),
+	bytes: _b64,
+	Binary: _b64,
+	dict: _dict,
+	list: _list,
+	tuple: _list,
+	set: _list,
+}
+
+
+def to_jsonable(value: Any) -> Any:
+	"""Recursively convert BSON/Python values (ObjectId, datetime, Decimal128, ...) to JSON types."""
+	kind = type(value)
+	if kind in _SCALARS:
+		return value
+	converter = _CONVERTERS.get(kind)
+	if converter is not None:
+		return converter(value)
+	if isinstance(value, (str, int, float)):
+		return value
+	for base, converter in _CONVERTERS.items():
+		if isinstance(value, base):
+			return converter(value)
+	if isinstance(value, Mapping):
+		return _dict(value)
+	return str(value)
+
+
+def as_str(value: Any) -> Any:
+	"""Field converter for ids stored as ObjectId (or already as strings)."""
+	return value if value is None or type(value) is str else str(value)
+
+
+def as_iso(value: Any) -> Any:
+	"""Field converter for datetime fields."""
+	return value.isoformat() if isinstance(value, (datetime, date)) else to_jsonable(value)
+
+
+def passthrough(value: Any) -> Any:
+	"""Field converter for fields known to hold plain JSON values (e.g. strings)."""
+	return value
+
+
+class FieldPlan:
+	"""Precompiled conversion plan for the documents of one collection.
+
+	Known fields get a dedicated converter so plain strings skip type dispatch entirely
+	and known BSON fields convert directly. Any other field (nested sub-documents,
+	attendee lists, ...) is left as it is: `dumps` converts BSON values inside it while
+	encoding, which is much cheaper than walking it in Python first. Encode results with
+	`dumps`. `_id` is renamed to `id` as the rest of the code base expects.
+	"""
+
+	def __init__(self, fields: Optional[Dict[str, Converter]] = None, rename: Optional[Dict[str, str]] = None):
+		self.fields: Dict[str, Converter] = {"_id": as_str, **(fields or {})}
+		self.rename: Dict[str, str] = {"_id": "id", **(rename or {})}
+
+	def apply(self, doc: Optional[Mapping[str, Any]]) -> Optional[Dict[str, Any]]:
+		if not doc:
+			return doc
+		fields = self.fields
+		rename = self.rename
+		out: Dict[str, Any] = {}
+		for key, value in doc.items():
+			converter = fields.get(key)
+			out[rename.get(key, key)] = value if converter is None else converter(value)
+		return out
+
+
+# Plan for documents of unknown shape
+GENERIC_PLAN = FieldPlan()
+
+
+def dumps(value: Any) -> str:
+	"""Compact JSON string for `value`, converting BSON types on the way (orjson when available)."""
+	if orjson is not None:
+		return orjson.dumps(value, default=to_jsonable).decode("utf-8")
+	return json.dumps(value, separators=(",", ":"), default=to_jsonable)
+
+
+__all__ = ["FieldPlan", "GENERIC_PLAN", "as_iso", "as_str", "dumps", "passthrough", "to_jsonable"]
@@ -0,0 +1,33 @@
+import asyncio
+import contextvars
+import functools
+from typing import Optional
+
+# Set inside speculative agent runs (lib/tiers.py); gated tools wait for the event
+_tool_gate: contextvars.ContextVar[Optional[asyncio.Event]] = contextvars.ContextVar("tool_gate", default=None)
+
+
+def hold_tools(gate: asyncio.Event) -> None:
+	"""Make gated tool calls in the current context wait until `gate` is set.
+
+	Used for speculative runs, which may still be cancelled: the model can start
+	working but no tool has side effects until the run is chosen.
+	"""
+	_tool_gate.set(gate)
+
+
+def held_until_chosen(func):
+	"""Decorator for async function tools: inside a speculative run, wait until the run
+	is chosen (see `hold_tools`) before calling the tool."""
+
+	@functools.wraps(func)
+	async def wrapper(*args, **kwargs):
+		gate = _tool_gate.get()
+		if gate is not None:
+			await gate.wait()
+		return await func(*args, **kwargs)
+
+	return wrapper
+
+
+__all__ = ["held_until_chosen", "hold_tools"]
@@ -0,0 +1,166 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from agents import RunConfig
+from agents.items import ModelResponse
+from agents.models.interface import Model, ModelProvider
+from agents.usage import Usage
+from openai.types.responses import ResponseOutputMessage, ResponseOutputText
+
+
+# Offline model provider used for benchmarks and soak tests. Enable it with
+# AGENT_MODEL_PROVIDER=stub; no OpenAI key or network access is needed.
+#
+#   STUB_MODEL_LATENCY_MS  simulated network/model latency per call (awaited)
+#   STUB_MODEL_CPU_MS      simulated per-call CPU work (busy loop, holds the GIL)
+#   STUB_MODEL_PROFILES    per-model overrides to simulate model tiers, e.g.
+#                          "gpt-4.1-mini:latency_ms=80;gpt-4.1:latency_ms=600,cpu_ms=2"
+#
+# Agents with a structured output_type get JSON generated from the output schema; the
+# values are derived from a hash of the input, so the same request always gets the
+# same (e.g. triage) answer.
+
+
+def _last_user_text(input: Any) -> str:
+	if isinstance(input, str):
+		return input
+	for item in reversed(list(input or [])):
+		if isinstance(item, dict) and item.get("role") == "user":
+			content = item.get("content")
+			return content if isinstance(content, str) else str(content)
+	return ""
+
+
+def _input_chars(system_instructions: Optional[str], input: Any) -> int:
+	if isinstance(input, str):
+		return len(system_instructions or "") + len(input)
+	return len(system_instructions or "") + sum(len(str(item.get("content", ""))) for item in input or [] if isinstance(item, dict))
+
+
+def _sample(schema: Dict[str, Any], defs: Dict[str, Any], rng: random.Random) -> Any:
+	"""A value matching a (strict) JSON schema."""
+	if "$ref" in schema:
+		return _sample(defs[schema["$ref"].rsplit("/", 1)[-1]], defs, rng)
+	if "enum" in schema:
+		return rng.choice(schema["enum"])
+	if "const" in schema:
+		return schema["const"]
+	for key in ("anyOf", "oneOf"):
+		if key in schema:
+			# Nullable fields come out as null some of the time
+			return _sample(rng.choice(schema[key]), defs, rng)
+	kind = schema.get("type")
+	if isinstance(kind, list):
+		kind = next((k for k in kind if k != "null"), "null")
+	if kind == "object":
+		return {name: _sample(prop, defs, rng) for name, prop in schema.get("properties", {}).items()}
+	if kind == "array":
+		return [_sample(schema.get("items", {}), defs, rng)]
+	if kind == "number":
+		return round(rng.random(), 3)
+	if kind == "integer":
+		return rng.randint(0, 10)
+	if kind == "boolean":
+		return rng.random() < 0.5
+	if kind == "null":
+		return None
+	return "stub"
+
+
+class StubModel(Model):
+	"""Model that answers every request with a canned reply and never calls tools.
+
+	Only non-streaming runs (Runner.run) are supported, which is all this app uses;
+	Runner.run_streamed against the stub raises NotImplementedError.
+	"""
+
+	def __init__(self, model_name: Optional[str] = None, latency_ms: float = 0.0, cpu_ms: float = 0.0, usage: Optional[Dict[str, Dict[str, int]]] = None):
+		self.model_name = model_name or "stub"
+		self.latency_ms = latency_ms
+		self.cpu_ms = cpu_ms
+		# Shared with the provider: model name -> {"requests", "input_tokens", "output_tokens"}
+		self.usage = usage if usage is not None else {}
+
+	async def get_response(self, system_instructions, input, model_settings=None, tools=None, output_schema=None, *args, **kwargs) -> ModelResponse:
+		input_tokens = _input_chars(system_instructions, input) // 4
+		totals = self.usage.setdefault(self.model_name, {"requests": 0, "input_tokens": 0, "output_tokens": 0})
+		# Input is paid for even if the call is cancelled (e.g. a losing speculative run)
+		totals["requests"] += 1
+		totals["input_tokens"] += input_tokens
+
+		if self.cpu_ms:
+			until = time.perf_counter() + self.cpu_ms / 1000
+			while time.perf_counter() < until:
+				pass
+		if self.latency_ms:
+			await asyncio.sleep(self.latency_ms / 1000)
+
+		user_text = _last_user_text(input)
+		if output_schema is not None and not output_schema.is_plain_text():
+			schema = output_schema.json_schema()
+			rng = random.Random(hashlib.md5(user_text.encode("utf-8")).hexdigest())
+			text = json.dumps(_sample(schema, schema.get("$defs", {}), rng))
+		else:
+			text = f"[{self.model_name}] {user_text}"
+		output_tokens = len(text) // 4
+		totals["output_tokens"] += output_tokens
+
+		message = ResponseOutputMessage(
+			id=f"msg_{uuid.uuid4().hex}",
+			type="message",
+			role="assistant",
+			status="completed",
+			content=[ResponseOutputText(type="output_text", text=text, annotations=[])],
+		)
+		usage = Usage(requests=1, input_tokens=input_tokens, output_tokens=output_tokens, total_tokens=input_tokens + output_tokens)
+		return ModelResponse(output=[message], usage=usage, response_id=None)
+
+	def stream_response(self, *args, **kwargs):
+		# Streaming runs are unsupported by design (see the class docstring)
+		raise NotImplementedError("StubModel does not support streaming runs; use Runner.run")
+
+
+def _parse_profiles(spec: str) -> Dict[str, Dict[str, float]]:
+	""""name:latency_ms=80,cpu_ms=1;other:latency_ms=600" -> {name: {latency_ms: 80, cpu_ms: 1}, ...}"""
+	profiles: Dict[str, Dict[str, float]] = {}
+	for part in filter(None, (p.strip() for p in spec.split(";"))):
+		name, _, settings = part.partition(":")
+		profiles[name.strip()] = {
+			key.strip(): float(value)
+			for key, _, value in (s.partition("=") for s in settings.split(",") if "=" in s)
+		}
+	return profiles
+
+
+class StubModelProvider(ModelProvider):
+	def __init__(self, latency_ms: Optional[float] = None, cpu_ms: Optional[float] = None, profiles: Optional[Dict[str, Dict[str, float]]] = None):
+		self.latency_ms = float(os.getenv("STUB_MODEL_LATENCY_MS", "0")) if latency_ms is None else latency_ms
+		self.cpu_ms = float(os.getenv("STUB_MODEL_CPU_MS", "0")) if cpu_ms is None else cpu_ms
+		self.profiles = _parse_profiles(os.getenv("STUB_MODEL_PROFILES", "")) if profiles is None else profiles
+		# Simulated token usage per model name, for cost comparisons
+		self.usage: Dict[str, Dict[str, int]] = {}
+
+	def get_model(self, model_name: Optional[str]) -> Model:
+		profile = self.profiles.get(model_name or "", {})
+		return StubModel(
+			model_name,
+			latency_ms=profile.get("latency_ms", self.latency_ms),
+			cpu_ms=profile.get("cpu_ms", self.cpu_ms),
+			usage=self.usage,
+		)
+
+
+def get_run_config() -> Optional[RunConfig]:
+	"""RunConfig for Runner.run: the stub provider when AGENT_MODEL_PROVIDER=stub, otherwise None (SDK defaults)."""
+	if os.getenv("AGENT_MODEL_PROVIDER") != "stub":
+		return None
+	return RunConfig(model_provider=StubModelProvider(), tracing_disabled=True)
+
+
+__all__ = ["StubModel", "StubModelProvider", "get_run_config"]
@@ -10,14 +10,20 @@ from datetime import datetime
 
 import websockets
 
+from lib.deadline import DeadlineExceeded, remaining_or
 
-async def send_and_receive(message: str, uri: str = "ws://localhost:8001", timeout: float = 10.0) -> Any:
+
+async def send_and_receive(message: str, uri: str = "ws://localhost:8001", timeout: Optional[float] = None) -> Any:
 	"""Connect to a websocket at `uri`, send `message`, await a single reply, and return it.
 
 	Behavior:
 	- If `uri` ends with '/ws/chat' we send a JSON ChatMessage compatible with the FastAPI task manager.
 	- Otherwise we send the raw text message (keeps compatibility with simple echo servers used in tests).
 
+	When `timeout` is omitted the remaining time on the current request deadline is used
+	(10 seconds outside of a request) and forwarded to the task manager so it can stop
+	working on the request once we have stopped waiting for it.
+
 	Returns the parsed JSON response when possible, or the raw text reply.
 	"""
 	websocket: Optional[websockets.WebSocketClientProtocol] = None
@@ -28,8 +34,10 @@ async def send_and_receive(message: str, uri: str = "ws://localhost:8001", timeo
 		try_uris.append(uri.rstrip('/') + '/ws/chat')
 
 	for try_uri in try_uris:
+		budget = timeout if timeout is not None else remaining_or(10.0)
 		try:
-			websocket = await websockets.connect(try_uri)
+			websocket = await asyncio.wait_for(websockets.connect(try_uri), timeout=budget)
+			budget = timeout if timeout is not None else remaining_or(10.0)
 
 			# If connecting to the FastAPI task manager endpoint, send JSON ChatMessage
 			if try_uri.rstrip('/').endswith('/ws/chat'):
@@ -39,12 +47,13 @@ async def send_and_receive(message: str, uri: str = "ws://localhost:8001", timeo
 					"user_id": "user",
 					"timestamp": datetime.utcnow().isoformat(),
 					"message_type": "chat",
+					"timeout": budget,
 				}
 				await websocket.send(json.dumps(payload))
 			else:
 				await websocket.send(message)
 
-			reply = await asyncio.wait_for(websocket.recv(), timeout=timeout)
+			reply = await asyncio.wait_for(websocket.recv(), timeout=budget)
 
 			# try parse JSON reply if possible
 			try:
@@ -56,6 +65,10 @@ async def send_and_receive(message: str, uri: str = "ws://localhost:8001", timeo
 			except Exception:
 				return reply
 
+		except DeadlineExceeded:
+			if websocket is not None:
+				await websocket.close()
+			raise
 		except Exception as e:
 			last_exc = e
 			# ensure websocket closed before trying next uri
@@ -73,7 +86,7 @@ async def send_and_receive(message: str, uri: str = "ws://localhost:8001", timeo
 	raise RuntimeError("Failed to connect to websocket")
 
 
-def send_and_receive_sync(message: str, uri: str = "ws://localhost:8001", timeout: float = 10.0) -> Any:
+def send_and_receive_sync(message: str, uri: str = "ws://localhost:8001", timeout: Optional[float] = None) -> Any:
 	"""Synchronous wrapper that runs the async send_and_receive using asyncio.run.
 
 	Useful for scripts that don't use an existing event loop.
@@ -0,0 +1,255 @@
+import asyncio
+import os
+import traceback
+from collections import Counter
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+from agents import Agent, RunConfig, Runner, TResponseInputItem
+from pydantic import BaseModel
+
+from lib.mongo import mongo_create_project, mongo_get_projects_list, mongo_update_meeting_project_id
+from lib.serialization import dumps
+from lib.speculation import hold_tools
+from lib.tools import get_meeting_details, get_meetings_list, get_projects_list, get_project_overview
+
+
+# Tiered model routing: a small, fast model triages every request and handles the ones
+# it is confident about; only complex or low-confidence requests escalate to the large
+# model. Configured per agent from the environment (PREFIX is CHAT or MEETING):
+#
+#   <PREFIX>_TRIAGE_MODEL      small model; tiered mode is off unless this is set
+#   <PREFIX>_MODEL             large model (default: the SDK's default model)
+#   <PREFIX>_TRIAGE_THRESHOLD  minimum triage confidence to stay on the small model
+#   <PREFIX>_SPECULATIVE       1: start the large model in parallel with triage, so an
+#                              escalation does not pay for the triage call in latency
+
+
+class TierConfig:
+	"""Models and escalation threshold for one agent."""
+
+	def __init__(self, small_model: str, large_model: Optional[str] = None, threshold: float = 0.7, speculative: bool = False):
+		self.small_model = small_model
+		self.large_model = large_model
+		self.threshold = threshold
+		self.speculative = speculative
+
+	@classmethod
+	def from_env(cls, prefix: str, threshold: float = 0.7) -> Optional["TierConfig"]:
+		small_model = os.getenv(f"{prefix}_TRIAGE_MODEL")
+		if not small_model:
+			return None
+		return cls(
+			small_model,
+			large_model=os.getenv(f"{prefix}_MODEL") or None,
+			threshold=float(os.getenv(f"{prefix}_TRIAGE_THRESHOLD", str(threshold))),
+			speculative=os.getenv(f"{prefix}_SPECULATIVE", "0").lower() in ("1", "true", "yes"),
+		)
+
+
+# Routing counters per agent, e.g. {"chat": {"small": 10, "large": 3, ...}}
+_stats: Dict[str, Counter] = {}
+
+
+def _count(agent: str, event: str) -> None:
+	_stats.setdefault(agent, Counter())[event] += 1
+
+
+def tier_metrics() -> Dict[str, Dict[str, int]]:
+	return {agent: dict(counts) for agent, counts in _stats.items()}
+
+
+async def _gated_run(agent: Agent, input_items: Any, run_config: Optional[RunConfig], gate: Optional[asyncio.Event]):
+	if gate is not None:
+		hold_tools(gate)
+	return await Runner.run(agent, input_items, run_config=run_config)
+
+
+async def _discard(task: Optional[asyncio.Task]) -> None:
+	if task is not None and not task.done():
+		task.cancel()
+		try:
+			await task
+		except BaseException:
+			pass
+
+
+def _confidence(value: float) -> float:
+	return min(1.0, max(0.0, value))
+
+
+# Chat
+
+class RequestTriage(BaseModel):
+	category: Literal["simple_lookup", "task_delegation", "complex_reasoning"]
+	confidence: float
+
+
+_CHAT_TRIAGE_INSTRUCTIONS = """
+You route requests sent to a project management assistant. Classify the user's latest request:
+- simple_lookup: answered by reading stored data (list or show projects, meetings, a project's status).
+- task_delegation: a single request about tasks that can be passed on to the task manager as is.
+- complex_reasoning: anything else, e.g. analysis or planning, several changes, or a request that depends on earlier messages you cannot see.
+Give your confidence in the classification between 0 and 1.
+"""
+
+# Characters of the previous assistant message shown to the triage model for context
+_TRIAGE_CONTEXT_CHARS = 500
+
+
+class TieredChat:
+	"""Runs a chat turn on the small or the large model, as decided by triage.
+
+	A speculative large-model run may be cancelled, so its tool calls are held back
+	(see `lib.speculation`) until triage has decided to use it.
+	"""
+
+	def __init__(self, agent: Agent, config: TierConfig):
+		self.config = config
+		self.small_agent = agent.clone(model=config.small_model)
+		self.large_agent = agent.clone(model=config.large_model) if config.large_model else agent
+		self.triage_agent = Agent(
+			name="Chat Triage Agent",
+			instructions=_CHAT_TRIAGE_INSTRUCTIONS,
+			model=config.small_model,
+			output_type=RequestTriage,
+		)
+
+	async def triage(self, input_items: List[TResponseInputItem], run_config: Optional[RunConfig] = None) -> RequestTriage:
+		# Only the latest request (and the reply it follows) instead of the whole history
+		request = input_items[-1]["content"]
+		previous = next((item["content"] for item in reversed(input_items[:-1]) if item.get("role") == "assistant"), None)
+		if previous:
+			request = f"Previous assistant message: {previous[:_TRIAGE_CONTEXT_CHARS]}\n\nLatest request: {request}"
+		response = await Runner.run(self.triage_agent, [{"type": "message", "role": "user", "content": request}], run_config=run_config)
+		return response.final_output
+
+	async def run(self, input_items: List[TResponseInputItem], run_config: Optional[RunConfig] = None):
+		gate = asyncio.Event() if self.config.speculative else None
+		speculative = asyncio.create_task(_gated_run(self.large_agent, input_items, run_config, gate)) if gate is not None else None
+		try:
+			try:
+				decision = await self.triage(input_items, run_config)
+			except Exception:
+				traceback.print_exc()
+				_count("chat", "triage_failed")
+				decision = None
+
+			if decision is not None and decision.category != "complex_reasoning" and _confidence(decision.confidence) >= self.config.threshold:
+				_count("chat", "small")
+				await _discard(speculative)
+				if speculative is not None:
+					_count("chat", "speculative_discarded")
+				return await Runner.run(self.small_agent, input_items, run_config=run_config)
+
+			_count("chat", "large")
+			if speculative is not None:
+				_count("chat", "speculative_used")
+				gate.set()
+				return await speculative
+			return await Runner.run(self.large_agent, input_items, run_config=run_config)
+		finally:
+			await _discard(speculative)
+
+
+# Meetings
+
+class MeetingAssignment(BaseModel):
+	# An existing project's id, or null to create a new project
+	project_id: Optional[str]
+	new_project_title: Optional[str]
+	new_project_due_date: Optional[str]
+	confidence: float
+	reason: str
+
+
+_MEETING_INSTRUCTIONS = """
+You decide which project a meeting belongs to, from the meeting notes, title and attendees and the list of existing projects you are given.
+Reply with the id of the matching project. If no project matches, set project_id to null and propose a title (and a due date, if one is mentioned) for a new project.
+Give your confidence in the assignment between 0 and 1 and a short reason.
+"""
+
+
+def _compact_projects(projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+	return [{"id": p.get("id"), "title": p.get("title"), "due_date": p.get("due_date")} for p in projects]
+
+
+class TieredMeetingCategoriser:
+	"""Assigns meetings to projects with a small model, escalating to a large one.
+
+	Both tiers only propose an assignment (the large one may look things up with
+	read-only tools); the chosen proposal is applied here, so a discarded speculative
+	run never changes any data.
+	"""
+
+	def __init__(self, config: TierConfig):
+		self.config = config
+		self.small_agent = Agent(
+			name="Meeting Triage Agent",
+			instructions=_MEETING_INSTRUCTIONS,
+			model=config.small_model,
+			output_type=MeetingAssignment,
+		)
+		large_agent = Agent(
+			name="Meeting Processor Agent",
+			instructions=_MEETING_INSTRUCTIONS + "\nIf needed, look at other meetings and at the project overviews to help make your decision.\n",
+			tools=[get_meeting_details, get_meetings_list, get_projects_list, get_project_overview],
+			output_type=MeetingAssignment,
+		)
+		self.large_agent = large_agent.clone(model=config.large_model) if config.large_model else large_agent
+
+	def is_acceptable(self, proposal: Optional[MeetingAssignment], project_ids: set) -> bool:
+		if proposal is None or _confidence(proposal.confidence) < self.config.threshold:
+			return False
+		if proposal.project_id:
+			return proposal.project_id in project_ids
+		return bool(proposal.new_project_title)
+
+	async def propose(self, meeting: Dict[str, Any], projects: List[Dict[str, Any]], run_config: Optional[RunConfig] = None) -> Tuple[MeetingAssignment, str]:
+		"""The assignment to apply and the tier ("small" or "large") that proposed it."""
+		message = [{"type": "message", "role": "user", "content": f"Meeting: {dumps(meeting)}\n\nProjects: {dumps(_compact_projects(projects))}"}]
+		speculative = asyncio.create_task(Runner.run(self.large_agent, message, run_config=run_config)) if self.config.speculative else None
+		try:
+			try:
+				proposal = (await Runner.run(self.small_agent, message, run_config=run_config)).final_output
+			except Exception:
+				traceback.print_exc()
+				_count("meeting", "triage_failed")
+				proposal = None
+
+			if self.is_acceptable(proposal, {p.get("id") for p in projects}):
+				_count("meeting", "small")
+				if speculative is not None:
+					_count("meeting", "speculative_discarded")
+				return proposal, "small"
+
+			_count("meeting", "large")
+			if speculative is not None:
+				_count("meeting", "speculative_used")
+				return (await speculative).final_output, "large"
+			return (await Runner.run(self.large_agent, message, run_config=run_config)).final_output, "large"
+		finally:
+			await _discard(speculative)
+
+	async def categorise(self, meeting: Dict[str, Any], run_config: Optional[RunConfig] = None) -> str:
+		"""Propose an assignment for `meeting` and apply it; returns a one-line report."""
+		projects = await asyncio.to_thread(mongo_get_projects_list)
+		proposal, tier = await self.propose(meeting, projects, run_config)
+
+		project_id = proposal.project_id if proposal.project_id in {p.get("id") for p in projects} else None
+		if project_id is None:
+			if not proposal.new_project_title:
+				return f"Could not categorise meeting {meeting.get('id')}: {proposal.reason}"
+			project = await asyncio.to_thread(mongo_create_project, proposal.new_project_title, proposal.new_project_due_date)
+			project_id = project["id"]
+		await asyncio.to_thread(mongo_update_meeting_project_id, meeting.get("id"), project_id)
+		return f"Assigned meeting {meeting.get('id')} to project {project_id} ({tier} model, confidence {_confidence(proposal.confidence):.2f}): {proposal.reason}"
+
+
+__all__ = [
+	"MeetingAssignment",
+	"RequestTriage",
+	"TierConfig",
+	"TieredChat",
+	"TieredMeetingCategoriser",
+	"tier_metrics",
+]
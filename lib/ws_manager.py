@@ -17,15 +17,20 @@ class WSManager:
             pass
 
     async def send_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
+        try:
+            await websocket.send_text(message)
+        except Exception:
+            # the socket is dead; don't keep it around
+            self.disconnect(websocket)
+            raise
 
     async def broadcast(self, message: str):
         for conn in list(self.active_connections):
             try:
                 await conn.send_text(message)
             except Exception:
-                # ignore send errors; disconnect handled elsewhere
-                pass
+                # evict dead sockets instead of retrying them on every broadcast
+                self.disconnect(conn)
 
 
 manager = WSManager()
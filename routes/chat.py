@@ -1,3 +1,4 @@
+import asyncio
 import json
 import uuid
 import json
@@ -10,8 +11,9 @@ from dotenv import load_dotenv
 from pydantic import BaseModel
 
 # Import the chat agent handler
-from lib.agent import handle_chat_message, conversation_store
+from lib.agent import handle_chat_message, conversation_store, response_cache
 from lib.ws_manager import manager as ws_manager
+from lib.deadline import DeadlineExceeded, deadline_scope
 
 load_dotenv()
 
@@ -23,6 +25,11 @@ class ChatMessage(BaseModel):
 	user_id: str = "user"
 	timestamp: str | None = None
 	message_type: str = "chat"
+	# Seconds the client is prepared to wait for a reply; the server stops working on
+	# the turn once it has passed
+	timeout: float | None = None
+	# Set to false to stop this session being served cached answers (true opts back in)
+	use_cache: bool | None = None
 
 class ChatResponse(BaseModel):
 	session_id: str
@@ -32,22 +39,67 @@ class ChatResponse(BaseModel):
 	message_type: str = "response"
 	success: bool = True
 	error: str | None = None
+	timed_out: bool = False
+	# What the turn got done before timing out (see Deadline.report)
+	partial: dict | None = None
 
-class ConnectionManager:
-	def __init__(self):
-		self.active_connections: list[WebSocket] = []
-
-	async def connect(self, websocket: WebSocket):
-		await websocket.accept()
-		self.active_connections.append(websocket)
-
-	def disconnect(self, websocket: WebSocket):
-		self.active_connections.remove(websocket)
+async def _run_turn(message: str, session_id: str, timeout: float | None) -> ChatResponse:
+	"""Run a single chat turn under a deadline and build the response for it."""
+	with deadline_scope(timeout) as deadline:
+		try:
+			agent_reply = await handle_chat_message(message, session_id=session_id)
+			print("Agent reply:", agent_reply)
+			return ChatResponse(
+				session_id=session_id,
+				message=agent_reply,
+				timestamp=datetime.now().isoformat()
+			)
+		except DeadlineExceeded as e:
+			return ChatResponse(
+				session_id=session_id,
+				message="Sorry, the agent ran out of time before finishing your request.",
+				timestamp=datetime.now().isoformat(),
+				success=False,
+				error=str(e),
+				timed_out=True,
+				partial=deadline.report()
+			)
+		except Exception as agent_err:
+			traceback.print_exc()
+			return ChatResponse(
+				session_id=session_id,
+				message="Sorry, the agent encountered an error.",
+				timestamp=datetime.now().isoformat(),
+				success=False,
+				error=str(agent_err)
+			)
 
-	async def send_message(self, message: str, websocket: WebSocket):
-		await websocket.send_text(message)
+async def _handle_text(data: str, session_id: str) -> ChatResponse:
+	"""Turn one incoming frame (JSON ChatMessage or plain text) into a response."""
+	try:
+		message_data = json.loads(data)
+	except json.JSONDecodeError:
+		# Handle plain text messages (backwards compatibility)
+		return await _run_turn(data, session_id, None)
 
-manager = ConnectionManager()
+	chat_message = ChatMessage(**message_data)
+	is_clear = chat_message.message_type == "clear" or chat_message.message.lower().strip() == "/clear"
+	if response_cache is not None:
+		if is_clear:
+			# A cleared session starts over with the default (cached answers allowed)
+			response_cache.set_opt_out(chat_message.session_id, False)
+		if chat_message.use_cache is not None:
+			response_cache.set_opt_out(chat_message.session_id, not chat_message.use_cache)
+	# Handle clear command coming from frontend
+	if is_clear:
+		# remove session history if present
+		conversation_store.pop(chat_message.session_id, None)
+		return ChatResponse(
+			session_id=chat_message.session_id or session_id,
+			message="Chat history has been cleared.",
+			timestamp=datetime.now().isoformat()
+		)
+	return await _run_turn(chat_message.message, chat_message.session_id or session_id, chat_message.timeout)
 
 @router.websocket("/ws/chat")
 async def websocket_endpoint(websocket: WebSocket):
@@ -86,72 +138,45 @@ async def websocket_endpoint(websocket: WebSocket):
 
 	# Register connection with shared manager
 	await ws_manager.connect(websocket)
+
+	# Frames are read independently of turn processing so that a client going away is
+	# noticed while the agent is still working, and the in-flight turn is cancelled.
+	inbox: asyncio.Queue[str | None] = asyncio.Queue()
+
+	async def _receive():
+		try:
+			while True:
+				inbox.put_nowait(await websocket.receive_text())
+		except WebSocketDisconnect:
+			pass
+		finally:
+			inbox.put_nowait(None)
+
+	receiver = asyncio.create_task(_receive())
 	try:
 		while True:
-			data = await websocket.receive_text()
-			# Try to parse JSON payloads first
+			data = await inbox.get()
+			if data is None:
+				break
+			turn = asyncio.create_task(_handle_text(data, session_id))
+			done, _ = await asyncio.wait({turn, receiver}, return_when=asyncio.FIRST_COMPLETED)
+			if turn not in done:
+				# Socket closed mid-turn: nobody will receive the reply
+				turn.cancel()
+				break
 			try:
-				message_data = json.loads(data)
-				chat_message = ChatMessage(**message_data)
-				# Forward to the agent
-				# Handle clear command coming from frontend
-				if chat_message.message_type == "clear" or chat_message.message.lower().strip() == "/clear":
-					# remove session history if present
-					conversation_store.pop(chat_message.session_id, None)
-					response = ChatResponse(
-						session_id=chat_message.session_id or session_id,
-						message="Chat history has been cleared.",
-						timestamp=datetime.now().isoformat()
-					)
-					await ws_manager.send_message(response.model_dump_json(), websocket)
-					continue
-				try:
-					agent_reply = await handle_chat_message(chat_message.message, session_id=chat_message.session_id)
-					print("Agent reply:", agent_reply)
-					response = ChatResponse(
-						session_id=chat_message.session_id or session_id,
-						message=agent_reply,
-						timestamp=datetime.now().isoformat()
-					)
-				except Exception as agent_err:
-					traceback.print_exc()
-					response = ChatResponse(
-						session_id=chat_message.session_id or session_id,
-						message="Sorry, the agent encountered an error.",
-						timestamp=datetime.now().isoformat(),
-						success=False,
-						error=str(agent_err)
-					)
-				await ws_manager.send_message(response.model_dump_json(), websocket)
-			except json.JSONDecodeError:
-				# Handle plain text messages (backwards compatibility)
-				try:
-					agent_reply = await handle_chat_message(data, session_id=session_id)
-					response = ChatResponse(
-						session_id=session_id,
-						message=agent_reply,
-						timestamp=datetime.now().isoformat()
-					)
-				except Exception as agent_err:
-					traceback.print_exc()
-					response = ChatResponse(
-						session_id=session_id,
-						message="Sorry, the agent encountered an error.",
-						timestamp=datetime.now().isoformat(),
-						success=False,
-						error=str(agent_err)
-					)
-				await ws_manager.send_message(response.model_dump_json(), websocket)
+				response = turn.result()
 			except Exception as e:
 				# Generic error handling for unexpected issues
 				traceback.print_exc()
-				error_response = ChatResponse(
+				response = ChatResponse(
 					session_id=session_id,
 					message="Sorry, I encountered an error processing your message.",
 					timestamp=datetime.now().isoformat(),
 					success=False,
 					error=str(e)
 				)
-				await manager.send_message(error_response.model_dump_json(), websocket)
-	except WebSocketDisconnect:
+			await ws_manager.send_message(response.model_dump_json(), websocket)
+	finally:
+		receiver.cancel()
 		ws_manager.disconnect(websocket)
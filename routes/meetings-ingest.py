@@ -0,0 +1,69 @@
+import asyncio
+import traceback
+from datetime import datetime, timezone
+from typing import List
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import JSONResponse, Response
+from lib.auth import check_api_key
+from lib.mongo import mongo_create_meeting, mongo_get_meeting_by_id, mongo_set_meeting_ingest_failed
+from lib.agent import categorise_meeting
+from lib.deadline import deadline_scope
+from lib.ingest import TranscriptIngestor
+from lib.serialization import dumps
+
+router = APIRouter()
+
+# Categorisation jobs started after ingestion (kept referenced until they finish)
+_background_tasks: set = set()
+
+
+async def _categorise(meeting_id: str, timeout: float | None):
+    with deadline_scope(timeout):
+        try:
+            meeting = mongo_get_meeting_by_id(meeting_id)
+            if meeting is not None:
+                await categorise_meeting(meeting)
+        except Exception:
+            traceback.print_exc()
+
+
+@router.post("/meetings/ingest")
+async def ingest_meeting(
+    request: Request,
+    title: str | None = None,
+    occurred_at: str | None = None,
+    attendees: List[str] = Query(default=[]),
+    categorise: bool = True,
+    timeout: float | None = None,
+    x_api_key: str | None = Header(default=None),
+):
+    """Ingest a meeting transcript sent as a streamed (e.g. chunked) text request body.
+
+    The body is never held in memory as a whole: it is stored in `meeting_chunks` and
+    summarised chunk by chunk while it arrives. Once `summary.short_summary` is written
+    the meeting is categorised in the background (unless `categorise=false`).
+    """
+    check_api_key(x_api_key)
+    try:
+        started_at = datetime.fromisoformat(occurred_at) if occurred_at else datetime.now(timezone.utc)
+    except ValueError:
+        return JSONResponse(content={"error": "occurred_at must be an ISO 8601 datetime"}, status_code=422)
+
+    meeting_id = await asyncio.to_thread(mongo_create_meeting, title, started_at, attendees)
+    ingestor = TranscriptIngestor(meeting_id)
+    try:
+        async for data in request.stream():
+            await ingestor.feed(data)
+        result = await ingestor.finish()
+    except Exception as e:
+        traceback.print_exc()
+        ingestor.cancel()
+        await asyncio.to_thread(mongo_set_meeting_ingest_failed, meeting_id, str(e))
+        return JSONResponse(content={"error": "Failed to ingest transcript", "meeting_id": meeting_id}, status_code=500)
+
+    if categorise:
+        task = asyncio.create_task(_categorise(meeting_id, timeout))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    return Response(content=dumps({**result, "categorising": categorise}), status_code=201, media_type="application/json")
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from lib.mongo import mongo_get_meeting_by_id
-from lib.agent import handle_new_meeting_record
+from lib.agent import categorise_meeting
+from lib.deadline import DeadlineExceeded, deadline_scope
+from lib.serialization import dumps
 
 router = APIRouter()
 
@@ -12,19 +14,24 @@ async def webhook_endpoint(request: Request):
 
     meeting_id = data.get("meeting_id")
 
-    # Get the meeting from mongodb
+    # The caller may say how long it will wait (seconds); the job is abandoned after that
+    with deadline_scope(data.get("timeout")) as deadline:
+        try:
+            # Get the meeting from mongodb
 
-    meeting = mongo_get_meeting_by_id(meeting_id)
+            meeting = mongo_get_meeting_by_id(meeting_id)
 
-    if meeting is None:
-        return JSONResponse(content={"error": "Meeting not found"}, status_code=404)
+            if meeting is None:
+                return JSONResponse(content={"error": "Meeting not found"}, status_code=404)
 
-    # Send to the agent to determine the project
+            # Send to the agent to determine the project
 
-    response = await handle_new_meeting_record("Categorise the following meeting based on the content and assign it a meeting ID in the database.\n " + str(meeting))
+            response = await categorise_meeting(meeting)
+        except DeadlineExceeded as e:
+            return JSONResponse(content={"error": str(e), "timed_out": True, "partial": deadline.report()}, status_code=504)
 
     if response is None:
         return JSONResponse(content={"error": "Failed to process meeting"}, status_code=500)
 
     # For now, just echo back the received data
-    return JSONResponse(content={"received": data, "meeting": meeting, "response": response})
+    return Response(content=dumps({"received": data, "meeting": meeting, "response": response}), media_type="application/json")
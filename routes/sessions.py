@@ -0,0 +1,60 @@
+import os
+import tracemalloc
+from typing import Any, Dict, List
+from fastapi import APIRouter, Body, Header
+from lib.auth import check_api_key
+from lib.agent import conversation_store, export_history, import_history, response_cache
+from lib.tiers import tier_metrics
+from lib.ws_manager import manager as ws_manager
+
+# Internal endpoints: health and session hand-over used by the multi-worker gateway
+# (lib/gateway.py), and per-process metrics and debug counters.
+router = APIRouter(prefix="/internal")
+
+
+@router.get("/health")
+async def health():
+    return {"status": "ok", "pid": os.getpid(), "sessions": len(conversation_store)}
+
+
+@router.get("/sessions/{session_id}")
+async def get_session(session_id: str, pop: bool = False, x_api_key: str | None = Header(default=None)):
+    check_api_key(x_api_key)
+    return {"session_id": session_id, **export_history(session_id, pop=pop)}
+
+
+@router.put("/sessions/{session_id}")
+async def put_session(
+    session_id: str,
+    history: List[Dict[str, Any]] = Body(..., embed=True),
+    cache_opt_out: bool = Body(False, embed=True),
+    x_api_key: str | None = Header(default=None),
+):
+    check_api_key(x_api_key)
+    import_history(session_id, history, cache_opt_out)
+    return {"session_id": session_id, "messages": len(history)}
+
+
+@router.get("/metrics")
+async def metrics(x_api_key: str | None = Header(default=None)):
+    check_api_key(x_api_key)
+    return {
+        "pid": os.getpid(),
+        "response_cache": response_cache.metrics() if response_cache is not None else None,
+        "model_tiers": tier_metrics(),
+    }
+
+
+@router.get("/debug")
+async def debug(x_api_key: str | None = Header(default=None)):
+    """Live sizes of the in-memory state that grows with traffic."""
+    check_api_key(x_api_key)
+    return {
+        "pid": os.getpid(),
+        "sessions": len(conversation_store),
+        "stored_messages": sum(len(history) for history in conversation_store.values()),
+        "connections": len(ws_manager.active_connections),
+        "response_cache_entries": response_cache.metrics()["entries"] if response_cache is not None else None,
+        "response_cache_opted_out_sessions": len(response_cache.opted_out) if response_cache is not None else None,
+        "tracemalloc_bytes": tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None,
+    }
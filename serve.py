@@ -0,0 +1,32 @@
+"""Multi-worker serving mode.
+
+Starts N `uvicorn main:app` worker processes and a front process that routes each
+`/ws/chat` session to a worker by consistent hashing (see lib/gateway.py), so in-memory
+conversation history stays local to one worker while using one core per worker.
+
+  python serve.py --workers 4 --port 8000
+"""
+import argparse
+import os
+import uvicorn
+from dotenv import load_dotenv
+
+from lib.gateway import create_app
+
+load_dotenv()
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of worker processes (default: CPU count)")
+	parser.add_argument("--host", default="0.0.0.0", help="front process bind address")
+	parser.add_argument("--port", type=int, default=8000, help="front process port")
+	parser.add_argument("--worker-base-port", type=int, default=9000, help="workers listen on 127.0.0.1 from this port upwards")
+	args = parser.parse_args()
+
+	app = create_app(args.workers, base_port=args.worker_base_port)
+	uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+	main()